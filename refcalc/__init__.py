@@ -0,0 +1,39 @@
+"""Headless sizing engine for the refrigeration calculator in app.py."""
+
+from .annual import iter_weather_array, iter_weather_csv, simulate
+from .facility import optimize_facility
+from .loads import (LOAD_COLUMNS, PRODUCT_TYPES, WARNING_MESSAGES, calculate, calculate_batch, get_warnings,
+                    warning_flags_batch)
+from .maps import CompressorMaps
+from .pulldown import simulate_pulldown
+from .refrigerant import REFRIGERANTS, SaturationTable, saturation_table
+from .reports import ReportTemplate, render_reports, size_rooms, write_reports
+from .selection import CapacityIndex, EquipmentCatalog
+from .sweep import Sweep, frange
+
+__all__ = [
+    "CapacityIndex",
+    "CompressorMaps",
+    "EquipmentCatalog",
+    "LOAD_COLUMNS",
+    "PRODUCT_TYPES",
+    "REFRIGERANTS",
+    "ReportTemplate",
+    "SaturationTable",
+    "Sweep",
+    "WARNING_MESSAGES",
+    "calculate",
+    "calculate_batch",
+    "frange",
+    "get_warnings",
+    "iter_weather_array",
+    "iter_weather_csv",
+    "optimize_facility",
+    "render_reports",
+    "saturation_table",
+    "simulate",
+    "simulate_pulldown",
+    "size_rooms",
+    "warning_flags_batch",
+    "write_reports",
+]
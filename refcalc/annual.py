@@ -0,0 +1,192 @@
+"""Hour-by-hour annual energy of sized rooms from TMY-style weather.
+
+Each room is sized once with the design inputs (`calculate_batch` and catalog
+first-fit), then run against its site's hourly ambient temperature using the
+Q1/Q2/Q3 formulas of `calculate()` without the safety factor. Weather arrives
+as a stream of ``(site_ids, temperatures)`` chunks with temperatures shaped
+(sites, hours), so neither a large CSV nor a large ``.npy`` archive (opened
+with ``np.load(path, mmap_mode="r")``) is ever fully in memory.
+"""
+
+import csv
+import itertools
+import os
+import warnings
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data import DEFAULT_INPUTS
+from .loads import calculate_batch, steady_loads
+from .selection import EquipmentCatalog, compressor_mode
+
+WeatherChunk = Tuple[List[Any], np.ndarray]
+
+RESULT_COLUMNS = ("annualKwh", "annualLoadKwh", "dutyCycle", "peakHours", "peakLoad", "peakHour")
+
+
+def _read_floats(lines: List[str], column: int) -> np.ndarray:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)  # a block of blank lines holds no data
+        return np.loadtxt(lines, delimiter=",", usecols=column, quotechar='"', comments=None, ndmin=1)
+
+
+def _site_runs(lines: List[str], site_index: Optional[int], default_site: str) -> Iterator[Tuple[str, int, int]]:
+    """``(site, start, stop)`` of each run of ``lines`` (grouped by site) with the same site."""
+    if site_index is None:
+        yield default_site, 0, len(lines)
+        return
+
+    def site_of(i):
+        return next(csv.reader([lines[i]]))[site_index]
+
+    start = 0
+    while start < len(lines):
+        name = site_of(start)
+        lo, hi = start + 1, len(lines)
+        if site_of(hi - 1) == name:
+            lo = hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if site_of(mid) == name:
+                lo = mid + 1
+            else:
+                hi = mid
+        yield name, start, lo
+        start = lo
+
+
+def iter_weather_csv(path: str, chunk_sites: int = 64, site_column: str = "site",
+                     temp_column: str = "temp", block_rows: int = 1 << 16) -> Iterator[WeatherChunk]:
+    """Stream a long-format weather CSV (one row per site and hour) in chunks of sites.
+
+    Rows must be grouped by site in hour order, as TMY exports are, and every
+    site must have the same number of hours. Site ids are the CSV strings; a
+    file without ``site_column`` is one site named after the file. Blocks of
+    ``block_rows`` lines have their temperatures parsed at once with
+    `np.loadtxt`; as rows are grouped, the site changes within a block are
+    found by bisection, so only a few lines per site are split in Python.
+    """
+    default_site = os.path.splitext(os.path.basename(path))[0]
+    sites: List[Any] = []
+    series: List[np.ndarray] = []
+    hours = None
+    site, parts = None, []
+
+    def finish_site():
+        nonlocal hours
+        values = np.concatenate(parts)
+        if hours is None:
+            hours = len(values)
+        elif len(values) != hours:
+            raise ValueError(f"{path}: site {site!r} has {len(values)} hours, expected {hours}")
+        sites.append(site)
+        series.append(values)
+
+    with open(path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader([f.readline()]), [])
+        if temp_column not in header:
+            raise ValueError(f"{path}: no {temp_column!r} column")
+        temp_index = header.index(temp_column)
+        site_index = header.index(site_column) if site_column in header else None
+        while True:
+            block = list(itertools.islice(f, block_rows))
+            if not block:
+                break
+            temps = _read_floats(block, temp_index)
+            if len(temps) != len(block):
+                block = [line for line in block if line.strip()]  # np.loadtxt skips blank lines
+            for name, start, stop in _site_runs(block, site_index, default_site):
+                if name != site:
+                    if parts:
+                        finish_site()
+                        if len(sites) == chunk_sites:
+                            yield sites, np.stack(series)
+                            sites, series = [], []
+                    site, parts = name, []
+                parts.append(temps[start:stop])
+    if parts:
+        finish_site()
+    if sites:
+        yield sites, np.stack(series)
+
+
+def iter_weather_array(temperatures, sites: Optional[Sequence[Any]] = None,
+                       chunk_sites: int = 64) -> Iterator[WeatherChunk]:
+    """Stream a (sites, hours) array, e.g. a memory-mapped ``.npy`` archive, in chunks of sites.
+
+    Sites are identified by ``sites`` or, by default, by row number.
+    """
+    n = temperatures.shape[0]
+    for start in range(0, n, chunk_sites):
+        stop = min(start + chunk_sites, n)
+        ids = list(sites[start:stop]) if sites is not None else list(range(start, stop))
+        yield ids, np.asarray(temperatures[start:stop], dtype=np.float64)
+
+
+def simulate(rooms: Mapping[str, Any], weather: Iterable[WeatherChunk],
+             catalog: Optional[EquipmentCatalog] = None, room_batch: int = 256) -> Dict[str, np.ndarray]:
+    """Annual energy of every room in ``rooms`` (columnar inputs plus a ``site`` column).
+
+    Returns arrays keyed by RESULT_COLUMNS plus ``compressor`` (catalog
+    position, -1 when nothing fits). Sites are matched by their string form,
+    so numeric room sites find the string ids of `iter_weather_csv`. Rooms
+    without a compressor or whose site never appears in ``weather`` get NaN;
+    a weather stream that matches no room at all raises ValueError.
+    """
+    catalog = catalog or EquipmentCatalog()
+    site_of_room = np.asarray(rooms["site"])
+    n = len(site_of_room)
+    design = {k: np.broadcast_to(v, (n,)) for k, v in calculate_batch(rooms).items()}
+    t_evap = np.broadcast_to(rooms.get("tEvap", DEFAULT_INPUTS["tEvap"]), (n,))
+    compressor = catalog.select_batch(design["requiredCapacity"], t_evap)["compressor"]
+    modes = compressor_mode(t_evap)
+    found = compressor >= 0
+    capacity = np.full(n, np.nan)
+    power = np.full(n, np.nan)
+    for mode in ("capLow", "capMed"):
+        rows = found & (modes == mode)
+        capacity[rows] = catalog.compressor_columns[mode][compressor[rows]]
+    power[found] = catalog.compressor_columns["power"][compressor[found]]
+
+    # hourly load = conductance * (ambient - internal) + constant part
+    conductance, internal = steady_loads(design)
+    constant = design["qProduct"] + internal
+    temp_internal = np.broadcast_to(np.asarray(rooms.get("tempInternal", DEFAULT_INPUTS["tempInternal"]), dtype=np.float64), (n,))
+
+    result = {name: np.full(n, np.nan) for name in RESULT_COLUMNS}
+    rooms_by_site: Dict[Any, List[int]] = {}
+    for i, site in enumerate(site_of_room.tolist()):
+        rooms_by_site.setdefault(str(site), []).append(i)
+
+    matched = False
+    for sites, temperatures in weather:
+        room_idx, site_row = [], []
+        for row, site in enumerate(sites):
+            members = rooms_by_site.get(str(site), ())
+            room_idx.extend(members)
+            site_row.extend([row] * len(members))
+        matched = matched or bool(room_idx)
+        room_idx = np.array(room_idx, dtype=np.intp)
+        site_row = np.array(site_row, dtype=np.intp)
+        for start in range(0, len(room_idx), room_batch):
+            idx = room_idx[start:start + room_batch]
+            ambient = temperatures[site_row[start:start + room_batch]]
+            load = ambient - temp_internal[idx, None]
+            load *= conductance[idx, None]
+            load += constant[idx, None]
+            np.maximum(load, 0, out=load)
+            duty = np.minimum(load / capacity[idx, None], 1.0)
+            result["annualKwh"][idx] = duty.sum(axis=1) * power[idx]
+            result["annualLoadKwh"][idx] = load.sum(axis=1)
+            result["dutyCycle"][idx] = duty.mean(axis=1)
+            result["peakHours"][idx] = (duty >= 1.0).sum(axis=1)
+            result["peakLoad"][idx] = load.max(axis=1)
+            result["peakHour"][idx] = load.argmax(axis=1)
+
+    if n and not matched:
+        raise ValueError("no room's site appears in the weather data")
+    for name in ("annualKwh", "dutyCycle", "peakHours"):
+        result[name][~found] = np.nan
+    result["compressor"] = compressor
+    return result
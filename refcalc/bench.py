@@ -0,0 +1,268 @@
+"""Benchmarks and golden-value checks for the sizing pipeline.
+
+Synthetic rooms and catalogs are drawn from a seeded generator, so every run
+times the same data. Sizes are 1, 1k and 1M rooms against the stock catalog
+("small") and a synthetic 20k-compressor one ("huge"). Before any timing,
+`check_golden` pins `calculate()` to hand-checked values and checks that the
+batch paths agree with it bit for bit. Per-stage numbers come from
+`refcalc.profiling`.
+
+Run with ``python -m refcalc.bench --json now.json --compare before.json``.
+The exit status is 1 when a golden check fails or a case got slower than
+``--tolerance`` times its baseline.
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from . import profiling
+from .data import U_VALUES
+from .loads import (LOAD_COLUMNS, PRODUCT_TYPES, WARNING_MESSAGES, calculate, calculate_batch, get_warnings,
+                    warning_flags_batch)
+from .reports import render_reports
+from .selection import EquipmentCatalog
+
+SIZES = {"1": 1, "1k": 1_000, "1M": 1_000_000}
+CATALOGS = ("small", "huge")
+# The scalar path (calculate, get_warnings, sizing and rendering reports) is timed on at most this many rooms.
+SCALAR_LIMIT = 10_000
+# Multi-unit searches take milliseconds each, so fewer rooms are timed.
+COMBINATION_LIMIT = 200
+
+GOLDEN = [
+    ({}, {
+        "volume": 15.0,
+        "surfaceArea": 37.0,
+        "qTransmission": 0.28490000000000004,
+        "qProduct": 0.010902777777777779,
+        "qAdditional": 0.40349,
+        "totalLoadContinuous": 0.8041866944444443,
+        "requiredCapacity": 1.0722489259259258,
+        "compressor": "2JES-07Y",
+        "evaporator": "ECO-3",
+        "warnings": 0,
+    }),
+    ({"length": 6.0, "width": 4.0, "height": 3.0, "insulation": 150, "tempAmbient": 32, "tempInternal": -22,
+      "productLoad": 2000, "productTemp": -5, "productType": "frozen", "tEvap": -30, "runHours": 20}, {
+        "volume": 72.0,
+        "surfaceArea": 108.0,
+        "qTransmission": 0.857304,
+        "qProduct": 0.01936111111111111,
+        "qAdditional": 0.7457303999999999,
+        "totalLoadContinuous": 2.0279943888888887,
+        "requiredCapacity": 2.4335932666666666,
+        "compressor": "4EES-4Y",
+        "evaporator": "ECO-5",
+        "warnings": 0,
+    }),
+    ({"length": 12.0, "width": 8.0, "height": 4.0, "insulation": 120, "tempAmbient": 38, "tempInternal": 2,
+      "productLoad": 15000, "productTemp": 20, "productType": "vegetables", "tEvap": -6, "runHours": 16}, {
+        "volume": 384.0,
+        "surfaceArea": 352.0,
+        "qTransmission": 2.3189759999999997,
+        "qProduct": 0.2985,
+        "qAdditional": 2.4518975999999997,
+        "totalLoadContinuous": 5.829779639999999,
+        "requiredCapacity": 8.744669459999999,
+        "compressor": "4DES-5Y",
+        "evaporator": "ECO-18",
+        "warnings": 1,
+    }),
+]
+
+
+def synthetic_rooms(n: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """``n`` rooms as `calculate_batch` columns, on the form's step sizes."""
+    rng = np.random.default_rng(seed)
+    temp_internal = rng.integers(-30, 11, n).astype(np.float64)
+    return {
+        "length": np.round(rng.uniform(1.5, 30.0, n), 1),
+        "width": np.round(rng.uniform(1.5, 20.0, n), 1),
+        "height": np.round(rng.uniform(2.2, 6.0, n), 1),
+        "insulation": rng.choice(np.array(sorted(U_VALUES), dtype=np.float64), n),
+        "tempAmbient": rng.integers(25, 46, n).astype(np.float64),
+        "tempInternal": temp_internal,
+        "productLoad": rng.integers(0, 401, n) * 50.0,
+        "productTemp": temp_internal + rng.integers(0, 31, n),
+        "productType": rng.integers(0, len(PRODUCT_TYPES), n),
+        "tEvap": temp_internal - rng.integers(5, 11, n),
+        "runHours": rng.integers(12, 23, n).astype(np.float64),
+    }
+
+
+def room_dicts(columns: Mapping[str, np.ndarray], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Form-input dicts for the scalar path from `synthetic_rooms` columns."""
+    n = len(columns["length"]) if limit is None else min(limit, len(columns["length"]))
+    lists = {k: v[:n].tolist() for k, v in columns.items()}
+    lists["productType"] = [PRODUCT_TYPES[code] for code in lists["productType"]]
+    lists["insulation"] = [int(v) for v in lists["insulation"]]
+    return [dict(zip(lists, values)) for values in zip(*lists.values())]
+
+
+def synthetic_catalog(compressors: int = 20_000, evaporators: int = 5_000, seed: int = 0) -> EquipmentCatalog:
+    """A large catalog with prices rising sub-linearly in capacity, in no particular order."""
+    rng = np.random.default_rng(seed)
+    cap_med = np.round(rng.uniform(0.5, 120.0, compressors), 2)
+    cap_low = np.round(cap_med * rng.uniform(0.45, 0.6, compressors), 2)
+    power = np.round(cap_med * rng.uniform(0.35, 0.55, compressors), 2)
+    price = np.round(300 * cap_med ** 0.7 * rng.uniform(0.85, 1.15, compressors))
+    evap_cap = np.round(rng.uniform(1.0, 150.0, evaporators), 1)
+    evap_price = np.round(150 * evap_cap ** 0.75 * rng.uniform(0.85, 1.15, evaporators))
+    return EquipmentCatalog(
+        [{"model": f"SYN-{i:05d}", "capLow": a, "capMed": b, "power": p, "price": c}
+         for i, (a, b, p, c) in enumerate(zip(cap_low.tolist(), cap_med.tolist(), power.tolist(), price.tolist()))],
+        [{"model": f"EVS-{i:05d}", "capacity": a, "price": c}
+         for i, (a, c) in enumerate(zip(evap_cap.tolist(), evap_price.tolist()))],
+    )
+
+
+def check_golden(rooms: int = 1_000, seed: int = 0) -> List[str]:
+    """Failures of the golden values and of batch/scalar agreement; empty when all pass."""
+    failures = []
+    catalog = EquipmentCatalog()
+    for inputs, expected in GOLDEN:
+        result = calculate(inputs)
+        got = dict(result)
+        got["compressor"] = result["selectedCompressor"]["model"]
+        got["evaporator"] = result["selectedEvaporator"]["model"]
+        got["warnings"] = len(get_warnings(inputs, result))
+        for key, value in expected.items():
+            if got[key] != value:
+                failures.append(f"golden {inputs or 'defaults'}: {key} = {got[key]!r}, expected {value!r}")
+
+    columns = synthetic_rooms(rooms, seed)
+    dicts = room_dicts(columns)
+    loads = calculate_batch(columns)
+    selected = catalog.select_batch(loads["requiredCapacity"], columns["tEvap"])
+    flags = warning_flags_batch(columns, loads)
+    for i, inputs in enumerate(dicts):
+        result = calculate(inputs)
+        for key in LOAD_COLUMNS:
+            if loads[key][i] != result[key]:
+                failures.append(f"room {i}: calculate_batch {key} = {loads[key][i]!r}, calculate {result[key]!r}")
+        c, e = selected["compressor"][i], selected["evaporator"][i]
+        if (catalog.compressors[c] if c >= 0 else None) is not result["selectedCompressor"]:
+            failures.append(f"room {i}: select_batch compressor differs from calculate")
+        if (catalog.evaporators[e] if e >= 0 else None) is not result["selectedEvaporator"]:
+            failures.append(f"room {i}: select_batch evaporator differs from calculate")
+        batch_warnings = [m for bit, m in enumerate(WARNING_MESSAGES) if flags[i] >> bit & 1]
+        if batch_warnings != get_warnings(inputs, result):
+            failures.append(f"room {i}: warning_flags_batch differs from get_warnings")
+    return failures
+
+
+def _cases(sizes, catalogs, seed) -> Iterator[Tuple[str, int, Callable[[], Any]]]:
+    """``(name, items, function)`` for every benchmark case."""
+    catalog_objects = {"small": EquipmentCatalog, "huge": lambda: synthetic_catalog(seed=seed)}
+    catalog_objects = {name: catalog_objects[name]() for name in catalogs}
+    for size in sizes:
+        columns = synthetic_rooms(SIZES[size], seed)
+        n = SIZES[size]
+        loads = calculate_batch(columns)
+        required, t_evap = loads["requiredCapacity"], columns["tEvap"]
+        yield f"loads/{size}", n, lambda: calculate_batch(columns)
+        yield f"warnings/{size}", n, lambda: warning_flags_batch(columns, loads)
+        for name, catalog in catalog_objects.items():
+            yield f"selection/{size}/{name}", n, lambda catalog=catalog: catalog.select_batch(required, t_evap)
+
+        dicts = room_dicts(columns, SCALAR_LIMIT)
+        yield f"scalar/{size}", len(dicts), lambda: [calculate(room) for room in dicts]
+        yield f"report/{size}", len(dicts), lambda: list(render_reports(dicts, workers=0))
+        if "huge" in catalog_objects:
+            # Twice the largest single unit, so every room needs a combination.
+            huge = catalog_objects["huge"]
+            big = required[:COMBINATION_LIMIT] + huge.compressor_columns["capMed"].max() * 2
+            yield (f"combination/{size}/huge", len(big),
+                   lambda: huge.cheapest_combinations(big, t_evap[:COMBINATION_LIMIT], max_units=6))
+
+
+def measure(function: Callable[[], Any], repeat: int = 3) -> float:
+    """Best wall-clock seconds of ``repeat`` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=tuple(SIZES), catalogs=CATALOGS, repeat: int = 3, seed: int = 0,
+        profile: bool = False) -> Dict[str, Any]:
+    """Time every case; with ``profile`` also collect per-stage numbers from an extra run of each."""
+    results = []
+    for name, items, function in _cases(sizes, catalogs, seed):
+        seconds = measure(function, repeat)
+        results.append({"name": name, "items": items, "seconds": seconds, "nsPerItem": seconds / items * 1e9})
+    stages = {}
+    if profile:
+        was_enabled = profiling.enabled()
+        profiling.reset()
+        try:
+            for _, _, function in _cases(sizes, catalogs, seed):
+                profiling.enable()
+                function()
+                profiling.disable()
+            stages = profiling.snapshot()
+        finally:
+            if was_enabled:
+                profiling.enable()
+    return {"seed": seed, "cases": results, "stages": stages}
+
+
+def compare(current: Mapping[str, Any], baseline: Mapping[str, Any], tolerance: float = 1.25) -> List[str]:
+    """Cases whose time per item exceeds ``tolerance`` times the baseline's."""
+    before = {case["name"]: case for case in baseline["cases"]}
+    slower = []
+    for case in current["cases"]:
+        old = before.get(case["name"])
+        if old and case["nsPerItem"] > tolerance * old["nsPerItem"]:
+            slower.append(f"{case['name']}: {case['nsPerItem']:.1f} ns/item, was {old['nsPerItem']:.1f}")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sizing pipeline benchmarks")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated subset of 1,1k,1M")
+    parser.add_argument("--catalogs", default=",".join(CATALOGS), help="comma-separated subset of small,huge")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", action="store_true", help="also report per-stage timings")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="baseline results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    failures = check_golden(seed=args.seed)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        return 1
+    print(f"golden checks passed ({len(GOLDEN)} rooms, batch == scalar on 1000 synthetic rooms)")
+
+    results = run(args.sizes.split(","), args.catalogs.split(","), args.repeat, args.seed, args.profile)
+    print(f"{'case':<28}{'items':>10}{'seconds':>12}{'ns/item':>12}")
+    for case in results["cases"]:
+        print(f"{case['name']:<28}{case['items']:>10}{case['seconds']:>12.4f}{case['nsPerItem']:>12.1f}")
+    if args.profile:
+        print()
+        print(profiling.report())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(results, json.load(f), args.tolerance)
+        for line in slower:
+            print(f"SLOWER {line}")
+        if slower:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Reference tables shared with the `RefrigerationCalculator` component in app.py.
+
+Keep these in step with the constants of the same name in app.py.
+"""
+
+PRODUCT_DATA = {
+    "meat": {"name": "ხორცი", "cp": 3.14, "freezingPoint": -2},
+    "fish": {"name": "თევზი", "cp": 3.78, "freezingPoint": -2},
+    "dairy": {"name": "რძის ნაწარმი", "cp": 3.85, "freezingPoint": -1},
+    "vegetables": {"name": "ბოსტნეული", "cp": 3.98, "freezingPoint": -1},
+    "fruits": {"name": "ხილი", "cp": 3.60, "freezingPoint": -2},
+    "frozen": {"name": "გაყინული", "cp": 2.05, "freezingPoint": -18},
+}
+
+U_VALUES = {
+    60: 0.367,
+    80: 0.275,
+    100: 0.220,
+    120: 0.183,
+    150: 0.147,
+    200: 0.110,
+}
+
+COMPRESSOR_CATALOG = [
+    {"model": "2KES-05Y", "capLow": 0.5, "capMed": 0.9, "power": 0.4, "price": 450},
+    {"model": "2JES-07Y", "capLow": 0.8, "capMed": 1.5, "power": 0.6, "price": 520},
+    {"model": "2HES-2Y", "capLow": 1.5, "capMed": 2.8, "power": 1.2, "price": 680},
+    {"model": "4FES-3Y", "capLow": 2.2, "capMed": 4.5, "power": 2.0, "price": 950},
+    {"model": "4EES-4Y", "capLow": 3.5, "capMed": 6.8, "power": 3.0, "price": 1200},
+    {"model": "4DES-5Y", "capLow": 4.8, "capMed": 9.5, "power": 4.5, "price": 1450},
+    {"model": "4CES-6Y", "capLow": 6.5, "capMed": 12.0, "power": 6.0, "price": 1700},
+    {"model": "4TES-9Y", "capLow": 8.5, "capMed": 16.0, "power": 8.0, "price": 2100},
+    {"model": "4PES-12Y", "capLow": 10.5, "capMed": 20.0, "power": 10.5, "price": 2400},
+]
+
+EVAPORATORS = [
+    {"model": "ECO-3", "capacity": 1.5, "price": 280},
+    {"model": "ECO-5", "capacity": 3.0, "price": 380},
+    {"model": "ECO-8", "capacity": 5.0, "price": 480},
+    {"model": "ECO-12", "capacity": 8.0, "price": 650},
+    {"model": "ECO-18", "capacity": 12.0, "price": 850},
+    {"model": "ECO-25", "capacity": 18.0, "price": 1100},
+]
+
+# Defaults of the form in app.py.
+DEFAULT_INPUTS = {
+    "length": 3.0,
+    "width": 2.0,
+    "height": 2.5,
+    "insulation": 100,
+    "tempAmbient": 35,
+    "tempInternal": 0,
+    "productLoad": 500,
+    "productTemp": 25,
+    "productType": "meat",
+    "tEvap": -8,
+    "tCond": 45,
+    "refrigerant": "R404A",
+    "runHours": 18,
+}
@@ -0,0 +1,181 @@
+"""Multi-chamber facilities served by shared compressor racks.
+
+Chambers are sized with `calculate_batch`, split into suction groups by
+`mode` (capLow / capMed, i.e. tEvap below or above -15 °C) and packed into
+racks first-fit decreasing so that no rack needs more than ``max_units``
+compressors. Each rack then gets a compressor multiset from the catalog
+with low purchase price plus energy cost (see `RackSolver`):
+
+    cost = Σ price + energy_cost · years · 8760 h · average load · Σ power / Σ capacity
+
+The average load is the diversified continuous load without safety factor;
+Σ power / Σ capacity is the rack's kW of input per kW of cooling. Racks are
+independent, so they are solved in a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from .data import DEFAULT_INPUTS
+from .loads import calculate_batch
+from .selection import EquipmentCatalog, cheapest_cover, compressor_mode, cost_lower_bounds, price_frontier
+
+HOURS_PER_YEAR = 8760
+
+
+class RackSolver:
+    """Compressor selection for racks of one mode.
+
+    The energy term makes the objective a ratio, so it is linearized: a rack
+    of capacity at least T costs at most the sum of per-model prices
+    ``price + weight / T · power``. For targets T from the required capacity
+    up in steps of ``tolerance``, the exact cheapest cover of T for those
+    prices (`cheapest_cover` over their Pareto frontier) is found and the
+    best true cost is kept. Whatever the capacity C of the optimal rack, the
+    target just below it gives a rack costing at most ``1 + tolerance`` times
+    as much. Targets stop once no rack that large can beat the best one: it
+    costs at least the lowest price per kW times T plus weight times the
+    lowest power per kW. The pure-price cover is always tried as well.
+    """
+
+    def __init__(self, capacity, price, power, max_units: int, tolerance: float = 0.01, steps: int = 1024):
+        self.capacity = np.asarray(capacity, dtype=np.float64)
+        self.price = np.asarray(price, dtype=np.float64)
+        self.power = np.asarray(power, dtype=np.float64)
+        self.max_units = max_units
+        self.tolerance = tolerance
+        self.steps = steps
+        self.largest = float(self.capacity.max())
+        self.smallest = float(self.capacity.min())
+        self.price_per_kw = float((self.price / self.capacity).min())
+        self.power_per_kw = float((self.power / self.capacity).min())
+
+    def _cover(self, required: float, unit_cost: np.ndarray) -> Optional[List[int]]:
+        frontier = price_frontier(self.capacity, unit_cost)
+        caps, costs = self.capacity[frontier], unit_cost[frontier]
+        bounds = cost_lower_bounds(caps, costs, self.max_units, self.steps)
+        found = cheapest_cover(caps.tolist(), costs.tolist(), bounds, required, self.max_units)
+        return None if found is None else frontier[found[1]].tolist()
+
+    def cost(self, chosen: List[int], weight: float) -> float:
+        return float(self.price[chosen].sum() + weight * self.power[chosen].sum() / self.capacity[chosen].sum())
+
+    def solve(self, required: float, weight: float) -> Optional[List[int]]:
+        """Catalog positions with Σ capacity >= required and low Σ price + weight · Σ power / Σ capacity."""
+        required = max(required, 0.0)
+        best = self._cover(required, self.price)
+        if best is None or weight <= 0:
+            return best
+        best_cost = self.cost(best, weight)
+        floor = weight * self.power_per_kw
+        # every rack has at least the smallest unit's capacity
+        target = max(required, self.smallest)
+        while self.price_per_kw * target + floor < best_cost:
+            chosen = self._cover(target, self.price + weight / target * self.power)
+            if chosen is None:
+                break
+            cost = self.cost(chosen, weight)
+            if cost < best_cost:
+                best, best_cost = chosen, cost
+            target *= 1 + self.tolerance
+        return best
+
+
+def pack_racks(loads: np.ndarray, limit: float) -> List[List[int]]:
+    """First-fit decreasing: positions of ``loads`` grouped so that no group sums above ``limit``."""
+    racks: List[List[int]] = []
+    totals: List[float] = []
+    for i in np.argsort(-loads, kind="stable").tolist():
+        for r, total in enumerate(totals):
+            if total + loads[i] <= limit:
+                racks[r].append(i)
+                totals[r] += loads[i]
+                break
+        else:
+            racks.append([i])
+            totals.append(float(loads[i]))
+    return racks
+
+
+_solvers: Dict[str, RackSolver] = {}
+
+
+def _init_worker(solvers: Dict[str, RackSolver]):
+    _solvers.update(solvers)
+
+
+def _solve(mode: str, required: float, weight: float):
+    return _solvers[mode].solve(required, weight)
+
+
+def optimize_facility(chambers: Mapping[str, Any], catalog: Optional[EquipmentCatalog] = None,
+                      max_units: int = 6, diversity: float = 0.85, energy_cost: float = 0.15,
+                      years: float = 1.0, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Group ``chambers`` (columnar `calculate()` inputs) into racks and pick each rack's compressors.
+
+    ``diversity`` scales the summed loads of racks with more than one chamber.
+    ``energy_cost`` is per kWh and ``years`` is how many years of energy count
+    against the purchase price. Chambers too big for even a full rack, and
+    chambers whose load is not finite (an unknown ``productType`` or
+    ``insulation``), are listed under ``unserved``. ``workers=0`` solves in-process.
+    """
+    catalog = catalog or EquipmentCatalog()
+    design = {k: np.atleast_1d(v) for k, v in calculate_batch(chambers).items()}
+    n = len(design["requiredCapacity"])
+    required = np.broadcast_to(design["requiredCapacity"], (n,))
+    average = np.broadcast_to(design["totalLoadContinuous"] / design["safetyFactor"], (n,))
+    t_evap = np.broadcast_to(np.asarray(chambers.get("tEvap", DEFAULT_INPUTS["tEvap"]), dtype=np.float64), (n,))
+    modes = compressor_mode(t_evap)
+    columns = catalog.compressor_columns
+    solvers = {mode: RackSolver(columns[mode], columns["price"], columns["power"], max_units)
+               for mode in np.unique(modes).tolist()}
+
+    racks, unserved = [], []
+    for mode, solver in solvers.items():
+        members = np.flatnonzero(modes == mode)
+        rack_limit = max_units * solver.largest
+        unservable = ~(required[members] <= rack_limit) | ~np.isfinite(average[members])
+        unserved.extend(members[unservable].tolist())
+        members = members[~unservable]
+        for group in pack_racks(required[members], rack_limit / diversity):
+            idx = members[group]
+            factor = diversity if len(idx) > 1 else 1.0
+            racks.append({
+                "mode": mode,
+                "chambers": idx.tolist(),
+                "suctionTemp": float(t_evap[idx].min()),
+                "requiredCapacity": float(required[idx].sum() * factor),
+                "averageLoad": float(average[idx].sum() * factor),
+            })
+
+    weight = energy_cost * years * HOURS_PER_YEAR
+    tasks = [(r["mode"], r["requiredCapacity"], weight * r["averageLoad"]) for r in racks]
+    if workers == 0:
+        _init_worker(solvers)
+        solutions = [_solve(*t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(workers or os.cpu_count() or 1, initializer=_init_worker,
+                                 initargs=(solvers,)) as pool:
+            solutions = list(pool.map(_solve, *zip(*tasks))) if tasks else []
+
+    for rack, chosen in zip(racks, solutions):
+        if chosen is None:
+            rack.update(compressors=[], capacity=0.0, price=float("nan"), annualKwh=float("nan"),
+                        cost=float("nan"))
+            continue
+        capacity = float(columns[rack["mode"]][chosen].sum())
+        power = float(columns["power"][chosen].sum())
+        price = float(columns["price"][chosen].sum())
+        annual_kwh = HOURS_PER_YEAR * rack["averageLoad"] * power / capacity
+        rack.update(compressors=[catalog.compressors[i] for i in chosen], capacity=capacity, price=price,
+                    annualKwh=annual_kwh, cost=price + energy_cost * years * annual_kwh)
+    return {
+        "racks": racks,
+        "unserved": sorted(unserved),
+        "totalPrice": sum(r["price"] for r in racks),
+        "annualKwh": sum(r["annualKwh"] for r in racks),
+        "totalCost": sum(r["cost"] for r in racks),
+    }
@@ -0,0 +1,263 @@
+"""Cooling-load model of `calculate()` in app.py, for one room or for columns of rooms.
+
+`calculate` is a line-by-line port of the component's closure and is the
+reference the vectorized `calculate_batch` is checked against. Both follow the
+same operation order so that the float64 results match the browser exactly.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .data import COMPRESSOR_CATALOG, DEFAULT_INPUTS, EVAPORATORS, PRODUCT_DATA, U_VALUES
+from .profiling import stage
+
+PRODUCT_TYPES = tuple(PRODUCT_DATA)
+INPUT_COLUMNS = (
+    "length",
+    "width",
+    "height",
+    "insulation",
+    "tempAmbient",
+    "tempInternal",
+    "productLoad",
+    "productTemp",
+    "productType",
+    "runHours",
+)
+LOAD_COLUMNS = (
+    "volume",
+    "surfaceArea",
+    "uValue",
+    "deltaT",
+    "qTransmission",
+    "qProduct",
+    "qAdditional",
+    "safetyFactor",
+    "totalLoadContinuous",
+    "requiredCapacity",
+)
+
+Q_PEOPLE = 0.3
+LIGHTING_W_PER_M3 = 5
+DOOR_OPENING_SHARE = 0.10  # of Q1
+
+# getWarnings() messages in check order; bit i of `warning_flags_batch` is message i.
+WARNING_MESSAGES = (
+    "⚠️ შიდა ტემპერატურა არ შეიძლება იყოს გარე ტემპერატურაზე მეტი!",
+    "⚠️ პროდუქტის ტემპერატურა არ შეიძლება იყოს კამერის ტემპერატურაზე ნაკლები!",
+    "⚠️ აორთქლების ტემპერატურა უნდა იყოს 5-8°C დაბალი!",
+    "ℹ️ დიდი მოცულობისთვის შეიძლება საჭირო გახდეს რამდენიმე აგრეგატი.",
+    "⚠️ პროდუქტის დატვირთვა ძალიან მაღალია!",
+)
+
+_INSULATION_MM = np.array(sorted(U_VALUES), dtype=np.float64)
+_U_BY_INSULATION = np.array([U_VALUES[k] for k in sorted(U_VALUES)], dtype=np.float64)
+_CP_BY_CODE = np.array([PRODUCT_DATA[k]["cp"] for k in PRODUCT_TYPES] + [np.nan], dtype=np.float64)
+
+
+def safety_factor(temp_internal: float) -> float:
+    factor = 1.15
+    if temp_internal < -15:
+        factor = 1.25
+    if temp_internal < -25:
+        factor = 1.30
+    return factor
+
+
+def steady_loads(design: Mapping[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Wall conductance (kW/K) and internal gains (kW) of `calculate_batch` columns.
+
+    The conductance is Q1 per kelvin plus door openings, the gains are
+    lighting plus people, as in `calculate`'s Q1 and Q3.
+    """
+    conductance = design["uValue"] * design["surfaceArea"] / 1000 * (1 + DOOR_OPENING_SHARE)
+    internal = LIGHTING_W_PER_M3 * design["volume"] / 1000 + Q_PEOPLE
+    return conductance, internal
+
+
+def calculate(inputs: Optional[Mapping[str, Any]] = None,
+              compressors=COMPRESSOR_CATALOG, evaporators=EVAPORATORS, maps=None) -> Dict[str, Any]:
+    """Size a single room; missing inputs fall back to the form defaults.
+
+    With ``maps`` (a `CompressorMaps` of ``compressors``) the compressor is
+    rated at the actual tEvap/tCond/refrigerant instead of the `mode` column,
+    and the result also carries its ``compressorCapacity``, ``compressorPower``
+    and ``eer``.
+    """
+    p = dict(DEFAULT_INPUTS)
+    if inputs:
+        p.update(inputs)
+    length, width, height = p["length"], p["width"], p["height"]
+    temp_internal = p["tempInternal"]
+
+    volume = length * width * height
+    surface_area = 2 * (length * width + length * height + width * height)
+    u_value = U_VALUES.get(p["insulation"], float("nan"))
+    delta_t = p["tempAmbient"] - temp_internal
+    q_transmission = (u_value * surface_area * delta_t) / 1000
+    cp_value = PRODUCT_DATA[p["productType"]]["cp"]
+    q_product = (p["productLoad"] * cp_value * (p["productTemp"] - temp_internal)) / (3600 * 1000)
+    q_lighting = (LIGHTING_W_PER_M3 * volume) / 1000
+    q_door_openings = q_transmission * DOOR_OPENING_SHARE
+    q_additional = q_lighting + Q_PEOPLE + q_door_openings
+    factor = safety_factor(temp_internal)
+    total_load_continuous = (q_transmission + q_product + q_additional) * factor
+    required_capacity = (total_load_continuous * 24) / p["runHours"]
+    mode = "capLow" if p["tEvap"] < -15 else "capMed"
+    selected_evaporator = next((e for e in evaporators if e["capacity"] >= required_capacity), None)
+    rating = {}
+    if maps is None:
+        selected_compressor = next((c for c in compressors if c[mode] >= required_capacity), None)
+    else:
+        point = maps.at(p["tEvap"], p["tCond"], p["refrigerant"])
+        i = next((i for i, cap in enumerate(point["capacity"].tolist()) if cap >= required_capacity), None)
+        selected_compressor = None if i is None else compressors[i]
+        rating = {
+            "compressorCapacity": None if i is None else float(point["capacity"][i]),
+            "compressorPower": None if i is None else float(point["power"][i]),
+            "eer": None if i is None else float(point["eer"][i]),
+        }
+    return {
+        "volume": volume,
+        "surfaceArea": surface_area,
+        "qTransmission": q_transmission,
+        "qProduct": q_product,
+        "qAdditional": q_additional,
+        "totalLoadContinuous": total_load_continuous,
+        "requiredCapacity": required_capacity,
+        "selectedCompressor": selected_compressor,
+        "selectedEvaporator": selected_evaporator,
+        "mode": mode,
+        "uValue": u_value,
+        "deltaT": delta_t,
+        "safetyFactor": factor,
+        **rating,
+    }
+
+
+def get_warnings(inputs: Optional[Mapping[str, Any]], results: Mapping[str, Any]) -> List[str]:
+    """Port of `getWarnings()`; ``results`` is the output of `calculate` for ``inputs``."""
+    p = dict(DEFAULT_INPUTS)
+    if inputs:
+        p.update(inputs)
+    warnings = []
+    if p["tempInternal"] >= p["tempAmbient"]:
+        warnings.append(WARNING_MESSAGES[0])
+    if p["productTemp"] < p["tempInternal"]:
+        warnings.append(WARNING_MESSAGES[1])
+    if p["tEvap"] >= p["tempInternal"]:
+        warnings.append(WARNING_MESSAGES[2])
+    if results["volume"] > 100:
+        warnings.append(WARNING_MESSAGES[3])
+    if p["productLoad"] / results["volume"] > 200:
+        warnings.append(WARNING_MESSAGES[4])
+    return warnings
+
+
+def encode_product_types(values) -> np.ndarray:
+    """Map product type names (or already-encoded codes) to indices into PRODUCT_TYPES.
+
+    Unknown names get code ``len(PRODUCT_TYPES)``, which yields NaN loads.
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iu":
+        return arr.astype(np.intp, copy=False)
+    arr = arr.astype(str, copy=False)
+    codes = np.full(arr.shape, len(PRODUCT_TYPES), dtype=np.intp)
+    for code, name in enumerate(PRODUCT_TYPES):
+        codes[arr == name] = code
+    return codes
+
+
+def u_value_lookup(insulation) -> np.ndarray:
+    """Vectorized `uValues[insulation]`; thicknesses not in the table give NaN."""
+    ins = np.asarray(insulation, dtype=np.float64)
+    idx = np.minimum(np.searchsorted(_INSULATION_MM, ins), len(_INSULATION_MM) - 1)
+    return np.where(_INSULATION_MM[idx] == ins, _U_BY_INSULATION[idx], np.nan)
+
+
+def calculate_batch(columns: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    """Vectorized `calculate()` load model over columnar room inputs.
+
+    ``columns`` maps the input names of INPUT_COLUMNS to arrays (or scalars,
+    which broadcast); missing columns take the form defaults. Returns a dict of
+    float64 arrays keyed by LOAD_COLUMNS. Equipment selection is not done here.
+    """
+    names = [n for n in INPUT_COLUMNS if n != "productType"]
+    values = [np.asarray(columns.get(n, DEFAULT_INPUTS[n]), dtype=np.float64) for n in names]
+    codes = encode_product_types(columns.get("productType", DEFAULT_INPUTS["productType"]))
+    *values, codes = np.broadcast_arrays(*values, codes)
+    c = dict(zip(names, values))
+    length, width, height = c["length"], c["width"], c["height"]
+    temp_internal = c["tempInternal"]
+
+    n = codes.size
+    with stage("geometry", n):
+        volume = length * width * height
+        surface_area = length * width
+        surface_area += length * height
+        surface_area += width * height
+        surface_area *= 2
+        u_value = u_value_lookup(c["insulation"])
+        delta_t = c["tempAmbient"] - temp_internal
+
+        q_transmission = u_value * surface_area
+        q_transmission *= delta_t
+        q_transmission /= 1000
+
+    with stage("product", n):
+        q_product = c["productLoad"] * _CP_BY_CODE[np.clip(codes, 0, len(PRODUCT_TYPES))]
+        q_product *= c["productTemp"] - temp_internal
+        q_product /= 3600 * 1000
+
+    with stage("additional", n):
+        q_additional = LIGHTING_W_PER_M3 * volume
+        q_additional /= 1000
+        q_additional += Q_PEOPLE
+        q_additional += q_transmission * DOOR_OPENING_SHARE
+
+    with stage("safety", n):
+        factor = np.where(temp_internal < -25, 1.30, np.where(temp_internal < -15, 1.25, 1.15))
+
+        total = q_transmission + q_product
+        total += q_additional
+        total *= factor
+        required = total * 24
+        required /= c["runHours"]
+
+    return {
+        "volume": volume,
+        "surfaceArea": surface_area,
+        "uValue": u_value,
+        "deltaT": delta_t,
+        "qTransmission": q_transmission,
+        "qProduct": q_product,
+        "qAdditional": q_additional,
+        "safetyFactor": factor,
+        "totalLoadContinuous": total,
+        "requiredCapacity": required,
+    }
+
+
+def warning_flags_batch(columns: Mapping[str, Any], loads: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Vectorized `get_warnings()` as a uint8 bit mask per room over WARNING_MESSAGES.
+
+    ``loads`` is the `calculate_batch` output for ``columns``; ``tEvap`` is read
+    from ``columns`` as well.
+    """
+    volume = loads["volume"]
+    with stage("warnings", volume.size):
+        c = {n: np.asarray(columns.get(n, DEFAULT_INPUTS[n]), dtype=np.float64)
+             for n in ("tempAmbient", "tempInternal", "productLoad", "productTemp", "tEvap")}
+        checks = (
+            c["tempInternal"] >= c["tempAmbient"],
+            c["productTemp"] < c["tempInternal"],
+            c["tEvap"] >= c["tempInternal"],
+            volume > 100,
+            c["productLoad"] / volume > 200,
+        )
+        flags = np.zeros(volume.shape, dtype=np.uint8)
+        for bit, check in enumerate(checks):
+            flags |= np.broadcast_to(check, volume.shape).astype(np.uint8) << bit
+    return flags
@@ -0,0 +1,177 @@
+"""Polynomial capacity and power maps of the compressor catalog.
+
+The catalog only rates each model at two points (`capLow`, `capMed`). Each
+model gets EN 12900 style 10-coefficient polynomials in Te and Tc fitted to a
+smooth surface through those ratings, all models in one least-squares solve,
+then corrected so the maps reproduce the catalog ratings exactly at
+RATING_POINTS. Evaluating every model at an operating point is one
+vector-matrix product, done the same way for one point or many so `at` and
+`evaluate` agree to the bit; the per-operating-point results used by
+selection are memoized.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .data import COMPRESSOR_CATALOG
+from .refrigerant import saturation_table
+
+# (Te, Tc) in °C at which the catalog columns are rated
+RATING_POINTS = {"capMed": (-10.0, 45.0), "capLow": (-30.0, 45.0)}
+
+# relative change per K of condensing / evaporating temperature used for the fitted surface
+CAPACITY_PER_K_TC = -0.012
+POWER_PER_K_TC = 0.015
+POWER_PER_K_TE = 0.01
+
+FIT_TE = np.arange(-45.0, 10.5, 1.0)
+FIT_TC = np.arange(20.0, 60.5, 1.0)
+
+
+def polynomial_terms(t_evap, t_cond) -> np.ndarray:
+    """EN 12900 terms 1, Te, Tc, Te², Te·Tc, Tc², Te³, Tc·Te², Te·Tc², Tc³ as the last axis."""
+    te = np.asarray(t_evap, dtype=np.float64)
+    tc = np.asarray(t_cond, dtype=np.float64)
+    te, tc = np.broadcast_arrays(te, tc)
+    return np.stack([np.ones_like(te), te, tc, te * te, te * tc, tc * tc,
+                     te ** 3, tc * te * te, te * tc * tc, tc ** 3], axis=-1)
+
+
+def tenths(t) -> np.ndarray:
+    """Temperatures in whole tenths of a kelvin, the operating-point grid of every rating path.
+
+    ``np.rint(t * 10)`` (like ``np.round(t, 1)``), not Python's `round`, which
+    rounds the exact decimal value and so differs on ties such as -10.05.
+    """
+    return np.rint(np.asarray(t, dtype=np.float64) * 10)
+
+
+def _products(columns: np.ndarray, terms: np.ndarray) -> np.ndarray:
+    """``terms[k] @ columns`` for each row k of ``terms``, as a (points, models) array.
+
+    One vector-matrix product per point: unlike a single matrix product, the
+    rounding of each value does not depend on how many points are evaluated.
+    """
+    out = np.empty((len(terms), columns.shape[1]))
+    for k, row in enumerate(terms):
+        np.dot(row, columns, out=out[k])
+    return out
+
+
+def _least_change(design: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """(10, points) map from residuals at ``points`` to the coefficient change that removes them.
+
+    Of all such changes it is the one that moves the fitted surface over
+    ``design`` least.
+    """
+    _, r = np.linalg.qr(design)
+    r_inv = np.linalg.inv(r)
+    return r_inv @ np.linalg.pinv(points @ r_inv)
+
+
+class CompressorMaps:
+    """Capacity (kW) and power (kW) maps for every model of a compressor catalog.
+
+    The fitted polynomials are evaluated in a basis that interpolates between
+    the two RATING_POINTS (`_offsets`): at those points every other term is
+    exactly zero, so the maps return the catalog `capMed`, `capLow` and
+    `power` to the bit there.
+    """
+
+    def __init__(self, compressors: Sequence[Mapping[str, Any]] = COMPRESSOR_CATALOG, cache_size: int = 256):
+        self.compressors = list(compressors)
+        self.cache_size = cache_size
+        cap_med = np.array([c["capMed"] for c in self.compressors], dtype=np.float64)
+        cap_low = np.array([c["capLow"] for c in self.compressors], dtype=np.float64)
+        power = np.array([c["power"] for c in self.compressors], dtype=np.float64)
+
+        te_med, tc_rating = RATING_POINTS["capMed"]
+        te_low, _ = RATING_POINTS["capLow"]
+        ratio = np.divide(cap_med, cap_low, out=np.ones_like(cap_med), where=cap_low > 0)
+        per_k_te = np.log(ratio) / (te_med - te_low)
+
+        te, tc = np.meshgrid(FIT_TE, FIT_TC, indexing="ij")
+        te, tc = te.ravel(), tc.ravel()
+        design = polynomial_terms(te, tc)
+        fit = np.linalg.pinv(design)
+        power_surface = (1 + POWER_PER_K_TC * (tc - tc_rating)) * (1 + POWER_PER_K_TE * (te - te_med))
+        self.power_coefficients = power[:, None] * (fit @ power_surface)[None, :]
+        self.capacity_coefficients = np.empty((len(self.compressors), fit.shape[0]))
+        for start in range(0, len(self.compressors), 4096):
+            part = slice(start, start + 4096)
+            surface = np.exp(np.outer(te - te_med, per_k_te[part]))
+            surface *= (1 + CAPACITY_PER_K_TC * (tc - tc_rating))[:, None]
+            self.capacity_coefficients[part] = (fit @ surface).T * cap_med[part, None]
+
+        # pull the fits through the ratings (capLow only where rated) with the least change to the surfaces
+        self.rating_terms = polynomial_terms([te_med, te_low], [tc_rating, tc_rating])
+        capacity = np.stack([cap_med, np.where(cap_low > 0, cap_low, self.capacity_coefficients @ self.rating_terms[1])])
+        self.capacity_coefficients += (capacity.T - self.capacity_coefficients @ self.rating_terms.T) \
+            @ _least_change(design, self.rating_terms).T
+        rated = self.rating_terms[:1]
+        self.power_coefficients += (power[:, None] - self.power_coefficients @ rated.T) @ _least_change(design, rated).T
+        power = np.stack([power, self.power_coefficients @ self.rating_terms[1]])
+
+        # columns for `_offsets`: the values at both rating points, then the coefficients of Te ... Tc³
+        self._capacity_columns = np.vstack([capacity, self.capacity_coefficients.T[1:]])
+        self._power_columns = np.vstack([power, self.power_coefficients.T[1:]])
+        self.operating_point = lru_cache(maxsize=cache_size)(self._operating_point)
+
+    def _offsets(self, terms: np.ndarray) -> np.ndarray:
+        """``terms`` (points, 10) in the rating-point basis of the ``_columns``.
+
+        The first two entries are the linear-in-Te weights of the capMed and
+        capLow rating points (1, 0 and 0, 1 there); the rest are the terms Te
+        ... Tc³ minus their interpolation between the rating points, so 0 at
+        both. The constant term drops out as the two weights add up to 1.
+        """
+        (te_med, _), (te_low, _) = RATING_POINTS["capMed"], RATING_POINTS["capLow"]
+        w_med = (terms[:, 1] - te_low) / (te_med - te_low)
+        w_low = 1 - w_med
+        offsets = np.empty((len(terms), 11))
+        offsets[:, 0] = w_med
+        offsets[:, 1] = w_low
+        offsets[:, 2:] = terms[:, 1:]
+        offsets[:, 2:] -= w_med[:, None] * self.rating_terms[0, 1:]
+        offsets[:, 2:] -= w_low[:, None] * self.rating_terms[1, 1:]
+        return offsets
+
+    def __len__(self):
+        return len(self.compressors)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["operating_point"]  # per-instance lru_cache wrappers do not pickle
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.operating_point = lru_cache(maxsize=self.cache_size)(self._operating_point)
+
+    def rate(self, t_evap, t_cond, refrigerant: str = "R404A") -> Tuple[np.ndarray, np.ndarray]:
+        """Capacity and power of every model at each (Te, Tc), as (models, points) arrays."""
+        te = np.atleast_1d(np.asarray(t_evap, dtype=np.float64))
+        terms = polynomial_terms(te, t_cond)
+        offsets = self._offsets(terms)
+        table = saturation_table(refrigerant)
+        # scaling the terms instead of the (models, points) result keeps the work per point small
+        capacity = _products(self._capacity_columns, offsets * table.capacity_ratio(terms[:, 1])[:, None])
+        power = _products(self._power_columns, offsets * table.power_ratio(terms[:, 1])[:, None])
+        return capacity.T, power.T
+
+    def evaluate(self, t_evap, t_cond, refrigerant: str = "R404A") -> Dict[str, np.ndarray]:
+        """Capacity, power and EER of every model at each (Te, Tc); arrays are (models, points)."""
+        capacity, power = self.rate(t_evap, t_cond, refrigerant)
+        return {"capacity": capacity, "power": power, "eer": capacity / power}
+
+    def _operating_point(self, t_evap: float, t_cond: float, refrigerant: str):
+        result = self.evaluate(t_evap, t_cond, refrigerant)
+        for values in result.values():
+            values.flags.writeable = False
+        return {k: v[:, 0] for k, v in result.items()}
+
+    def at(self, t_evap: float, t_cond: float, refrigerant: str = "R404A") -> Dict[str, np.ndarray]:
+        """Per-model capacity, power and EER at one operating point (read-only, memoized to 0.1 K, see `tenths`)."""
+        return self.operating_point(float(tenths(t_evap)) / 10, float(tenths(t_cond)) / 10, refrigerant)
@@ -0,0 +1,130 @@
+"""Optional per-stage timing and counters for the sizing pipeline.
+
+Instrumented code wraps each stage in ``with stage("name", items):``. While
+profiling is off (the default) `stage` returns a shared no-op context
+manager, so the cost is one function call per stage per batch. Stages are
+only placed on batch paths (``calculate_batch``, ``select_batch``, report
+chunks, ...); the scalar `calculate()` is left bare. Turn it on
+with `enable()` or by setting ``REFCALC_PROFILE=1`` before import; read the
+numbers with `snapshot()`. Counters are per process: pool workers start with
+`init_worker` and send `drain()` back with each chunk, which the parent adds
+to its own counters with `merge`.
+"""
+
+import os
+import time
+from typing import Dict, List
+
+_enabled = False
+_stats: Dict[str, list] = {}
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Stage:
+    __slots__ = ("name", "items", "start")
+
+    def __init__(self, name: str, items: int):
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter_ns() - self.start
+        entry = _stats.get(self.name)
+        if entry is None:
+            entry = _stats[self.name] = [0, 0, 0]
+        entry[0] += 1
+        entry[1] += self.items
+        entry[2] += elapsed
+        return False
+
+
+_NULL = _NullStage()
+
+
+def stage(name: str, items: int = 1):
+    """Context manager timing one run of stage ``name`` over ``items`` rooms (or reports, ...)."""
+    if not _enabled:
+        return _NULL
+    return _Stage(name, items)
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    _stats.clear()
+
+
+def init_worker(profile: bool):
+    """Start a pool worker with the parent's on/off state and no counters (fork copies the parent's)."""
+    global _enabled
+    _enabled = profile
+    _stats.clear()
+
+
+def drain() -> Dict[str, List[int]]:
+    """The raw counters since the last drain, leaving this process's counters empty."""
+    stats = dict(_stats)
+    _stats.clear()
+    return stats
+
+
+def merge(stats: Dict[str, List[int]]):
+    """Add raw counters from `drain` (usually another process's) to this process's."""
+    for name, (calls, items, ns) in stats.items():
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = [0, 0, 0]
+        entry[0] += calls
+        entry[1] += items
+        entry[2] += ns
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Per stage: calls, items, total seconds and nanoseconds per item."""
+    return {
+        name: {
+            "calls": calls,
+            "items": items,
+            "seconds": ns / 1e9,
+            "nsPerItem": ns / items if items else 0.0,
+        }
+        for name, (calls, items, ns) in _stats.items()
+    }
+
+
+def report() -> str:
+    """`snapshot` as an aligned text table, slowest stage first."""
+    rows = sorted(snapshot().items(), key=lambda kv: -kv[1]["seconds"])
+    lines = [f"{'stage':<16}{'calls':>10}{'items':>14}{'seconds':>12}{'ns/item':>12}"]
+    for name, s in rows:
+        lines.append(f"{name:<16}{s['calls']:>10}{s['items']:>14}{s['seconds']:>12.4f}{s['nsPerItem']:>12.1f}")
+    return "\n".join(lines)
+
+
+if os.environ.get("REFCALC_PROFILE", "").lower() in ("1", "true", "yes"):
+    enable()
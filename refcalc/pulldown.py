@@ -0,0 +1,146 @@
+"""Transient pull-down of a freshly loaded room, including freezing of the product.
+
+`calculate()` treats the product as a steady sensible load. Here the product
+is a lumped mass tracked by its specific enthalpy relative to the
+`freezingPoint` of `PRODUCT_DATA`, so sensible cooling, the latent plateau
+and sub-cooling of the frozen product follow from one state variable. The
+room air has negligible heat capacity next to the product and is solved
+algebraically every step: the thermostat holds `tempInternal` while the
+compressor can, otherwise the compressor runs flat out and the air floats.
+All rooms are stepped together with explicit Euler steps sized from the
+fastest product time constant still active.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+
+from .data import DEFAULT_INPUTS, PRODUCT_DATA
+from .loads import PRODUCT_TYPES, calculate_batch, encode_product_types, steady_loads
+from .selection import EquipmentCatalog, compressor_mode
+
+# approximate latent heat of fusion (kJ/kg) and specific heat below freezing (kJ/kg·K)
+FREEZING_DATA = {
+    "meat": {"latentHeat": 233.0, "cpFrozen": 1.67},
+    "fish": {"latentHeat": 245.0, "cpFrozen": 1.72},
+    "dairy": {"latentHeat": 260.0, "cpFrozen": 1.80},
+    "vegetables": {"latentHeat": 300.0, "cpFrozen": 1.95},
+    "fruits": {"latentHeat": 280.0, "cpFrozen": 1.85},
+    "frozen": {"latentHeat": 0.0, "cpFrozen": 2.05},
+}
+
+# product-to-air conductance per kg of product, kW/(K·kg)
+PRODUCT_CONDUCTANCE = 0.0002
+
+RESULT_COLUMNS = ("pulldownHours", "peakLoad", "energyRemovedKwh", "finalProductTemp", "capacity")
+
+
+def _by_code(key: str, table) -> np.ndarray:
+    return np.array([table[k][key] for k in PRODUCT_TYPES] + [np.nan], dtype=np.float64)
+
+
+_CP = _by_code("cp", PRODUCT_DATA)
+_FREEZING_POINT = _by_code("freezingPoint", PRODUCT_DATA)
+_LATENT = _by_code("latentHeat", FREEZING_DATA)
+_CP_FROZEN = _by_code("cpFrozen", FREEZING_DATA)
+
+
+def product_temperature(h, cp, cp_frozen, latent, freezing_point):
+    """Product temperature from specific enthalpy ``h`` (kJ/kg, 0 = unfrozen at the freezing point)."""
+    frozen = h < -latent
+    return np.where(h > 0, freezing_point + h / cp,
+                    np.where(frozen, freezing_point + (h + latent) / cp_frozen, freezing_point))
+
+
+def product_enthalpy(t, cp, cp_frozen, latent, freezing_point):
+    """Inverse of `product_temperature`, taking the product as fully frozen below its freezing point."""
+    return np.where(t >= freezing_point, cp * (t - freezing_point), -latent + cp_frozen * (t - freezing_point))
+
+
+def simulate_pulldown(rooms: Mapping[str, Any], catalog: Optional[EquipmentCatalog] = None,
+                      capacity=None, target_hours=None, tolerance: float = 1.0,
+                      max_hours: float = 72.0, max_step: float = 600.0,
+                      conductance: float = PRODUCT_CONDUCTANCE) -> Dict[str, np.ndarray]:
+    """Pull ``productLoad`` kg from ``productTemp`` down to ``tempInternal`` in every room.
+
+    ``capacity`` (kW) defaults to the design compressor of each room, chosen
+    as in `calculate()`. A room is pulled down once its product is within
+    ``tolerance`` K of the set point; rooms not there after ``max_hours`` get
+    NaN pull-down time. ``peakLoad`` is the largest heat removal needed to
+    hold the set point, starting with the load at t=0 (also for rooms
+    already within ``tolerance``), and ``energyRemovedKwh`` the heat taken
+    out. With
+    ``target_hours`` a ``meetsTarget`` column tells whether the pull-down
+    finishes in time.
+    """
+    catalog = catalog or EquipmentCatalog()
+    design = {k: np.atleast_1d(v) for k, v in calculate_batch(rooms).items()}
+    n = len(design["requiredCapacity"])
+
+    def column(name):
+        value = rooms.get(name, DEFAULT_INPUTS[name])
+        return np.broadcast_to(np.asarray(value, dtype=np.float64), (n,)).copy()
+
+    t_evap = np.broadcast_to(rooms.get("tEvap", DEFAULT_INPUTS["tEvap"]), (n,))
+    if capacity is None:
+        compressor = catalog.select_batch(design["requiredCapacity"], t_evap)["compressor"]
+        capacity = np.full(n, np.nan)
+        modes = compressor_mode(t_evap)
+        for mode in ("capLow", "capMed"):
+            rows = (compressor >= 0) & (modes == mode)
+            capacity[rows] = catalog.compressor_columns[mode][compressor[rows]]
+        capacity[compressor < 0] = 0.0
+    capacity = np.broadcast_to(np.asarray(capacity, dtype=np.float64), (n,)).copy()
+
+    codes = np.broadcast_to(encode_product_types(rooms.get("productType", DEFAULT_INPUTS["productType"])), (n,))
+    codes = np.clip(codes, 0, len(PRODUCT_TYPES))
+    cp, cp_frozen, latent, freezing = _CP[codes], _CP_FROZEN[codes], _LATENT[codes], _FREEZING_POINT[codes]
+    mass = column("productLoad")
+    set_point = column("tempInternal")
+    ambient = column("tempAmbient")
+    product_ua = conductance * mass
+    wall_ua, internal = steady_loads(design)
+    h = product_enthalpy(column("productTemp"), cp, cp_frozen, latent, freezing)
+    tau = np.minimum(cp, cp_frozen) / conductance
+
+    pulldown = np.full(n, np.nan)
+    # the load at t=0, so rooms already within tolerance still report it
+    tp = product_temperature(h, cp, cp_frozen, latent, freezing)
+    peak = product_ua * (tp - set_point) + wall_ua * (ambient - set_point) + internal
+    energy = np.zeros(n)
+    active = np.flatnonzero(mass > 0)
+    pulldown[mass <= 0] = 0.0
+    t = 0.0
+    while active.size and t < max_hours * 3600:
+        a = active
+        tp = product_temperature(h[a], cp[a], cp_frozen[a], latent[a], freezing[a])
+        done = tp - set_point[a] <= tolerance
+        if done.any():
+            pulldown[a[done]] = t / 3600
+            active = a = a[~done]
+            tp = tp[~done]
+            if not a.size:
+                break
+        dt = min(max_step, 0.05 * float(tau[a].min()), max_hours * 3600 - t)
+        demand = product_ua[a] * (tp - set_point[a]) + wall_ua[a] * (ambient[a] - set_point[a]) + internal[a]
+        removed = np.clip(demand, 0, capacity[a])
+        short = demand > capacity[a]
+        air = set_point[a].copy()
+        air[short] = ((product_ua[a] * tp + wall_ua[a] * ambient[a] + internal[a] - capacity[a])
+                      / (product_ua[a] + wall_ua[a]))[short]
+        h[a] -= product_ua[a] * (tp - air) * dt / mass[a]
+        peak[a] = np.maximum(peak[a], demand)
+        energy[a] += removed * dt / 3600
+        t += dt
+
+    final = product_temperature(h, cp, cp_frozen, latent, freezing)
+    result = {
+        "pulldownHours": pulldown,
+        "peakLoad": peak,
+        "energyRemovedKwh": energy,
+        "finalProductTemp": final,
+        "capacity": capacity,
+    }
+    if target_hours is not None:
+        result["meetsTarget"] = pulldown <= np.asarray(target_hours, dtype=np.float64)
+    return result
@@ -0,0 +1,95 @@
+"""Saturation properties of the refrigerants offered in the form (R404A, R449A).
+
+The source tables are approximate engineering values every 10 K (dew line for
+the zeotropic R449A); replace them with the supplier's data for design work.
+They are resampled once onto a dense uniform grid, so lookups are a single
+vectorized index computation instead of a search.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+TABLE_TEMPERATURES = np.arange(-50.0, 70.0, 10.0)
+
+# absolute saturation pressure, bar
+SATURATION_PRESSURE = {
+    "R404A": [0.82, 1.32, 2.05, 3.06, 4.37, 6.09, 8.26, 10.95, 14.24, 18.20, 22.93, 28.55],
+    "R449A": [0.63, 1.05, 1.68, 2.56, 3.75, 5.30, 7.28, 9.75, 12.80, 16.50, 21.00, 26.30],
+}
+
+# latent heat of vaporization, kJ/kg
+LATENT_HEAT = {
+    "R404A": [210.0, 205.0, 199.0, 192.0, 184.0, 176.0, 166.0, 155.0, 142.0, 127.0, 108.0, 83.0],
+    "R449A": [250.0, 245.0, 238.0, 230.0, 221.0, 211.0, 200.0, 187.0, 172.0, 155.0, 134.0, 107.0],
+}
+
+# compressor capacity and power relative to the R404A catalog ratings, by evaporating temperature
+RATIO_TEMPERATURES = np.array([-40.0, -30.0, -20.0, -10.0, 0.0, 10.0])
+CAPACITY_RATIO = {
+    "R404A": [1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+    "R449A": [0.90, 0.93, 0.96, 0.98, 1.00, 1.01],
+}
+POWER_RATIO = {
+    "R404A": [1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+    "R449A": [0.92, 0.93, 0.94, 0.95, 0.96, 0.97],
+}
+
+REFRIGERANTS = tuple(SATURATION_PRESSURE)
+
+
+class SaturationTable:
+    """Dense uniform-grid saturation table for one refrigerant.
+
+    Values outside the tabulated range are clamped to its ends.
+    """
+
+    def __init__(self, refrigerant: str, step: float = 0.05):
+        if refrigerant not in SATURATION_PRESSURE:
+            raise ValueError(f"unknown refrigerant {refrigerant!r}")
+        self.refrigerant = refrigerant
+        self.t_min = float(TABLE_TEMPERATURES[0])
+        self.step = step
+        grid = np.arange(self.t_min, TABLE_TEMPERATURES[-1] + step / 2, step)
+        self.grid = grid
+        # pressure is close to exponential in temperature, so interpolate its log
+        self._pressure = np.exp(np.interp(grid, TABLE_TEMPERATURES, np.log(SATURATION_PRESSURE[refrigerant])))
+        self._latent_heat = np.interp(grid, TABLE_TEMPERATURES, LATENT_HEAT[refrigerant])
+        self._capacity_ratio = np.interp(grid, RATIO_TEMPERATURES, CAPACITY_RATIO[refrigerant])
+        self._power_ratio = np.interp(grid, RATIO_TEMPERATURES, POWER_RATIO[refrigerant])
+
+    def _lookup(self, values: np.ndarray, t) -> np.ndarray:
+        x = (np.asarray(t, dtype=np.float64) - self.t_min) / self.step
+        x = np.clip(x, 0, len(self.grid) - 1)
+        i = np.minimum(x.astype(np.intp), len(self.grid) - 2)
+        frac = x - i
+        return values[i] * (1 - frac) + values[i + 1] * frac
+
+    def pressure(self, t) -> np.ndarray:
+        """Saturation pressure (bar abs) at ``t`` °C."""
+        return self._lookup(self._pressure, t)
+
+    def latent_heat(self, t) -> np.ndarray:
+        """Latent heat of vaporization (kJ/kg) at ``t`` °C."""
+        return self._lookup(self._latent_heat, t)
+
+    def pressure_ratio(self, t_evap, t_cond) -> np.ndarray:
+        return self.pressure(t_cond) / self.pressure(t_evap)
+
+    def capacity_ratio(self, t_evap) -> np.ndarray:
+        """Compressor capacity relative to the R404A catalog rating at ``t_evap``."""
+        return self._lookup(self._capacity_ratio, t_evap)
+
+    def power_ratio(self, t_evap) -> np.ndarray:
+        """Compressor power relative to the R404A catalog rating at ``t_evap``."""
+        return self._lookup(self._power_ratio, t_evap)
+
+
+_tables: Dict[str, SaturationTable] = {}
+
+
+def saturation_table(refrigerant: str) -> SaturationTable:
+    """Shared `SaturationTable` for ``refrigerant``, built on first use."""
+    if refrigerant not in _tables:
+        _tables[refrigerant] = SaturationTable(refrigerant)
+    return _tables[refrigerant]
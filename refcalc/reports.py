@@ -0,0 +1,282 @@
+"""Bulk text reports for sized rooms, the batch form of `downloadReport()`.
+
+Templates use `str.format` fields over a sized room (the output of
+`calculate()` plus ``warnings``) and a few derived fields. A template is
+compiled once into a single %-format string and a list of field getters, so
+rendering a report is one tuple build and one string interpolation. Chunks of
+raw form inputs are sized and rendered by worker processes, and the reports
+are streamed into a ZIP archive or one concatenated text file; only a window
+of chunks is in flight at a time.
+"""
+
+import os
+import re
+import string
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from decimal import ROUND_HALF_UP, Decimal
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .loads import calculate, get_warnings
+from . import profiling
+from .profiling import stage
+from .selection import EquipmentCatalog
+
+NOT_FOUND = "ვერ მოიძებნა"
+
+# the report `downloadReport()` produces in app.py
+BASIC_TEMPLATE = (
+    "ᲡᲐᲛᲐᲪᲘᲕᲠᲝ ᲡᲘᲡᲢᲔᲛᲘᲡ ᲒᲐᲗᲕᲚᲘᲡ ᲐᲜᲒᲐᲠᲘᲨᲘ\n\n"
+    "მოცულობა: {volume:.1f} მ³\n"
+    "საჭირო სიმძლავრე: {requiredCapacity:.2f} kW\n\n"
+    "კომპრესორი: {compressorLine}\n"
+    "გამაორთქლებელი: {evaporatorLine}\n\n"
+    "STOCK LTD © 2026"
+)
+
+DETAILED_TEMPLATE = (
+    "ᲡᲐᲛᲐᲪᲘᲕᲠᲝ ᲡᲘᲡᲢᲔᲛᲘᲡ ᲒᲐᲗᲕᲚᲘᲡ ᲐᲜᲒᲐᲠᲘᲨᲘ\n\n"
+    "მოცულობა: {volume:.1f} მ³\n"
+    "Q1 (კედლები): {qTransmission:.2f} kW\n"
+    "Q2 (პროდუქტი): {qProduct:.2f} kW\n"
+    "Q3 (დამატებითი): {qAdditional:.2f} kW\n"
+    "Safety Factor: +{safetyPercent:.0f}%\n"
+    "საჭირო სიმძლავრე: {requiredCapacity:.2f} kW\n\n"
+    "კომპრესორი: {compressorLine}\n"
+    "გამაორთქლებელი: {evaporatorLine}\n"
+    "სულ: {totalLine}\n"
+    "{warningsBlock}\n"
+    "STOCK LTD © 2026"
+)
+
+
+def _number(value) -> str:
+    """A price as JavaScript prints it: 450 rather than 450.0."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def to_fixed(value, digits: int) -> str:
+    """``value.toFixed(digits)`` as JavaScript prints it.
+
+    Python's fixed-point formatting rounds exact binary ties to even, while
+    `toFixed` rounds them away from zero (12.25 gives "12.3", not "12.2").
+    """
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "Infinity" if value > 0 else "-Infinity"
+    if value == 0:
+        value = 0.0  # -0 prints without a sign
+    num, den = value.as_integer_ratio()
+    scaled = num * 10 ** digits * 2
+    if scaled % den == 0 and scaled // den % 2:
+        return str(Decimal(value).quantize(Decimal(1).scaleb(-digits), ROUND_HALF_UP))
+    return "%.*f" % (digits, value)
+
+
+# A ``combination`` is only searched for when the single compressor or evaporator is missing, so
+# when there is one it replaces the single units on every line. Each unit line is priced on its
+# own; only the total line carries the combination price.
+
+def _compressor_line(room: Mapping[str, Any]) -> str:
+    combination = room.get("combination")
+    if combination:
+        models = " + ".join(f"BITZER {c['model']}" for c in combination["compressors"])
+        return f"{models} - ${_number(sum(c['price'] for c in combination['compressors']))}"
+    c = room.get("selectedCompressor")
+    if c:
+        return f"BITZER {c['model']} - ${_number(c['price'])}"
+    return NOT_FOUND
+
+
+def _evaporator_line(room: Mapping[str, Any]) -> str:
+    combination = room.get("combination")
+    if combination:
+        models = " + ".join(e["model"] for e in combination["evaporators"])
+        return f"{models} - ${_number(sum(e['price'] for e in combination['evaporators']))}"
+    e = room.get("selectedEvaporator")
+    if e:
+        return f"{e['model']} - ${_number(e['price'])}"
+    return NOT_FOUND
+
+
+def _total_line(room: Mapping[str, Any]) -> str:
+    combination = room.get("combination")
+    if combination:
+        return f"${_number(combination['price'])}"
+    c = room.get("selectedCompressor")
+    if c:
+        e = room.get("selectedEvaporator")
+        return f"${_number(c['price'] + (e['price'] if e else 0))}"
+    return NOT_FOUND
+
+
+def _warnings_block(room: Mapping[str, Any]) -> str:
+    warnings = room.get("warnings")
+    if not warnings:
+        return ""
+    return "\nგაფრთხილებები:\n" + "".join(f"- {w}\n" for w in warnings)
+
+
+DERIVED_FIELDS: Dict[str, Callable[[Mapping[str, Any]], Any]] = {
+    "compressorLine": _compressor_line,
+    "evaporatorLine": _evaporator_line,
+    "totalLine": _total_line,
+    "warningsBlock": _warnings_block,
+    "safetyPercent": lambda room: (room["safetyFactor"] - 1) * 100,
+}
+
+
+_FIXED_SPEC = re.compile(r"\.(\d+)f")
+
+
+def _formatter(spec: str) -> Optional[Callable[[Any], str]]:
+    """How a field with format ``spec`` is printed; ``.Nf`` follows JavaScript `toFixed`."""
+    if not spec:
+        return None
+    fixed = _FIXED_SPEC.fullmatch(spec)
+    if fixed:
+        digits = int(fixed.group(1))
+        return lambda value: to_fixed(value, digits)
+    return lambda value: format(value, spec)
+
+
+class ReportTemplate:
+    """A `str.format` template compiled to one %-format string and its field getters."""
+
+    def __init__(self, text: str = DETAILED_TEMPLATE):
+        self.text = text
+        pieces = []
+        self.fields: List[Tuple[Callable[[Mapping[str, Any]], Any], Optional[Callable[[Any], str]]]] = []
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            pieces.append(literal.replace("%", "%%"))
+            if field is None:
+                continue
+            if conversion or not field.isidentifier():
+                raise ValueError(f"unsupported template field {{{field}}}")
+            getter = DERIVED_FIELDS.get(field) or itemgetter(field)
+            self.fields.append((getter, _formatter(spec)))
+            pieces.append("%s")
+        self.format = "".join(pieces)
+
+    def render(self, room: Mapping[str, Any]) -> str:
+        return self.format % tuple(fmt(get(room)) if fmt else get(room) for get, fmt in self.fields)
+
+
+def size_rooms(rooms: Iterable[Mapping[str, Any]], catalog: Optional[EquipmentCatalog] = None,
+               max_units: int = 4) -> Iterator[Dict[str, Any]]:
+    """Lazily size form inputs into report records (result, warnings and the room's ``id``).
+
+    Rooms no single compressor or no single evaporator can serve get the
+    cheapest multi-unit ``combination``.
+    """
+    catalog = catalog or EquipmentCatalog()
+    for room in rooms:
+        inputs = {k: v for k, v in room.items() if k != "id"}
+        result = calculate(inputs, catalog.compressors, catalog.evaporators)
+        result["warnings"] = get_warnings(inputs, result)
+        result["combination"] = None
+        if result["selectedCompressor"] is None or result["selectedEvaporator"] is None:
+            result["combination"] = catalog.cheapest_combination(result["requiredCapacity"], result["mode"], max_units)
+        result["id"] = room.get("id")
+        yield result
+
+
+def _report_chunk(template: ReportTemplate, catalog: EquipmentCatalog, max_units: int, start: int,
+                  rooms: List[Mapping[str, Any]]) -> List[Tuple[str, bytes]]:
+    with stage("sizing", len(rooms)):
+        sized = list(size_rooms(rooms, catalog, max_units))
+    out = []
+    with stage("report", len(rooms)):
+        for i, room in enumerate(sized, start):
+            name = room["id"]
+            out.append((f"report_{name if name is not None else i}.txt", template.render(room).encode("utf-8")))
+    return out
+
+
+def _chunks(rooms: Iterable[Mapping[str, Any]], size: int) -> Iterator[Tuple[int, List[Mapping[str, Any]]]]:
+    chunk, start = [], 0
+    for room in rooms:
+        chunk.append(room)
+        if len(chunk) == size:
+            yield start, chunk
+            start += size
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def render_reports(rooms: Iterable[Mapping[str, Any]], template: str = DETAILED_TEMPLATE,
+                   workers: Optional[int] = None, chunk_size: int = 2000,
+                   catalog: Optional[EquipmentCatalog] = None, max_units: int = 4) -> Iterator[Tuple[str, bytes]]:
+    """Size form inputs (each with an optional ``id``) and yield ``(file name, UTF-8 report)`` in input order.
+
+    ``workers=0`` works in-process; otherwise chunks of raw inputs go to a
+    process pool, which sizes (as `size_rooms`) and renders them, with at most
+    two chunks per worker outstanding.
+    """
+    compiled = ReportTemplate(template)  # fail fast on a bad template
+    catalog = catalog or EquipmentCatalog()
+    if workers == 0:
+        for start, chunk in _chunks(rooms, chunk_size):
+            yield from _report_chunk(compiled, catalog, max_units, start, chunk)
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(template, catalog, max_units, profiling.enabled())) as pool:
+        pending = []
+        for start, chunk in _chunks(rooms, chunk_size):
+            pending.append(pool.submit(_run_worker_chunk, start, chunk))
+            if len(pending) >= 2 * workers:
+                yield from _worker_result(pending.pop(0))
+        for future in pending:
+            yield from _worker_result(future)
+
+
+def write_reports(rooms: Iterable[Mapping[str, Any]], path: str, template: str = DETAILED_TEMPLATE,
+                  workers: Optional[int] = None, chunk_size: int = 2000,
+                  compression: int = zipfile.ZIP_STORED, separator: str = "\n\f\n",
+                  catalog: Optional[EquipmentCatalog] = None, max_units: int = 4) -> int:
+    """Size ``rooms`` (form inputs), write every report to ``path`` and return how many were written.
+
+    A ``.zip`` path gets one entry per report; any other path gets the reports
+    concatenated with ``separator`` between them.
+    """
+    reports = render_reports(rooms, template, workers, chunk_size, catalog, max_units)
+    count = 0
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path, "w", compression=compression) as archive:
+            for name, data in reports:
+                archive.writestr(name, data)
+                count += 1
+        return count
+    sep = separator.encode("utf-8")
+    with open(path, "wb") as f:
+        for name, data in reports:
+            if count:
+                f.write(sep)
+            f.write(data)
+            count += 1
+    return count
+
+
+_worker_state = None
+
+
+def _init_worker(template: str, catalog: EquipmentCatalog, max_units: int, profile: bool):
+    global _worker_state
+    _worker_state = (ReportTemplate(template), catalog, max_units)
+    profiling.init_worker(profile)
+
+
+def _run_worker_chunk(start: int, rooms: List[Mapping[str, Any]]):
+    return _report_chunk(*_worker_state, start, rooms), profiling.drain()
+
+
+def _worker_result(future) -> List[Tuple[str, bytes]]:
+    reports, stats = future.result()
+    profiling.merge(stats)
+    return reports
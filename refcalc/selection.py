@@ -0,0 +1,399 @@
+"""Equipment selection over the compressor and evaporator catalogs.
+
+`calculate()` picks the first catalog entry whose capacity covers the load.
+`CapacityIndex` answers the same first-fit question with a bisect over the
+capacities sorted once, so large catalogs and whole batches of loads are cheap.
+`select_at` rates the compressors at the actual (Te, Tc, refrigerant) through
+their polynomial maps instead of the two catalog columns.
+When no single compressor is big enough, `EquipmentCatalog.cheapest_combination`
+searches for the cheapest set of compressor + evaporator units instead.
+"""
+
+import bisect
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data import COMPRESSOR_CATALOG, EVAPORATORS
+from .maps import CompressorMaps, tenths
+from .profiling import stage
+
+MODES = ("capLow", "capMed")
+
+# operating points with at least this many loads in `select_at_batch` get a sorted index
+INDEX_MIN_LOADS = 16
+
+
+def compressor_mode(t_evap):
+    """The `mode` column of `calculate()`: capLow below -15 °C evaporation."""
+    return np.where(np.asarray(t_evap) < -15, "capLow", "capMed")
+
+
+def cost_lower_bounds(capacities, prices, max_units: int, steps: int = 4096):
+    """Lower bounds on the price of covering a load with at most m units, m = 1..max_units.
+
+    ``capacities`` must be sorted ascending. Bounds are tabulated on a grid of
+    ``steps`` loads up to ``max_units`` times the largest unit; returns
+    ``(step, table)`` where ``table[m - 1, k]`` bounds any load at or above
+    ``k * step``. Row 1 is the exact cheapest single unit and row m adds each
+    unit to the row m-1 bound of what it leaves uncovered.
+    """
+    caps, prices = np.asarray(capacities, dtype=np.float64), np.asarray(prices, dtype=np.float64)
+    step = max_units * caps[-1] / steps
+    grid = np.arange(steps + 1) * step
+    cheapest_above = np.append(np.minimum.accumulate(prices[::-1])[::-1], np.inf)
+    rows = [cheapest_above[np.searchsorted(caps, grid, side="left")]]
+    chunk = max(1, (1 << 22) // (steps + 1))
+    for _ in range(1, max_units):
+        previous = np.append(rows[-1], 0.0)  # index -1: the unit alone covers the load
+        row = previous[:-1].copy()
+        for start in range(0, len(caps), chunk):
+            c, p = caps[start:start + chunk], prices[start:start + chunk]
+            rest = np.floor((grid[:, None] - c[None, :]) / step - 1e-9).astype(np.intp)
+            np.maximum(rest, -1, out=rest)
+            np.minimum(row, (p[None, :] + previous[rest]).min(axis=1), out=row)
+        rows.append(row)
+    return step, np.array(rows)
+
+
+def price_frontier(capacity: np.ndarray, price: np.ndarray) -> np.ndarray:
+    """Positions of the capacity/price Pareto frontier, by ascending capacity.
+
+    Anything that costs at least as much as a larger item is dropped, so along
+    the frontier capacity and price both increase strictly.
+    """
+    by_capacity = np.lexsort((price, -capacity))
+    sorted_price = price[by_capacity]
+    cheaper_above = np.concatenate(([np.inf], np.minimum.accumulate(sorted_price)[:-1]))
+    return by_capacity[sorted_price < cheaper_above][::-1]
+
+
+def cheapest_cover(capacities: Sequence[float], prices: Sequence[float], bounds, required: float,
+                   max_units: int) -> Optional[Tuple[float, List[int]]]:
+    """Cheapest multiset of at most ``max_units`` frontier items whose capacities add up to at least ``required``.
+
+    ``capacities``/``prices`` are a `price_frontier` (both strictly
+    increasing) and ``bounds`` its `cost_lower_bounds`. Branch and bound:
+    items are chosen in non-increasing capacity order, the last one is always
+    the cheapest that covers the remainder (the last pair is solved in one
+    vectorized step), and branches are visited in order of their lower bound
+    until it cannot beat the incumbent. A branch is bounded by the larger of
+    the ``bounds`` table and the rest of the load at the lowest price per kW
+    among items no larger than the one just chosen; only the latter knows
+    that later items cannot be larger, which matters when big units are the
+    cheapest per kW. Returns ``(price, positions)`` or None.
+    """
+    caps, prices = list(capacities), list(prices)
+    cap_arr, price_arr = np.asarray(caps, dtype=np.float64), np.asarray(prices, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_kw = np.minimum.accumulate(np.where(cap_arr > 0, price_arr / cap_arr, np.inf))
+    step, table = bounds
+    best = [np.inf, None]
+
+    def search(remaining, slots, limit, cost, chosen):
+        j = bisect.bisect_left(caps, remaining)
+        if j <= limit and cost + prices[j] < best[0]:
+            best[0] = cost + prices[j]
+            best[1] = chosen + [j]
+        if slots == 1:
+            return
+        lo = bisect.bisect_left(caps, remaining / slots)
+        hi = min(limit, j - 1)
+        if lo > hi:
+            return
+        us = np.arange(lo, hi + 1)
+        if slots == 2:
+            # the second item is always the cheapest one covering the rest
+            rest = np.searchsorted(cap_arr, remaining - cap_arr[us], side="left")
+            totals = cost + price_arr[us] + price_arr[rest]
+            k = int(np.argmin(totals))
+            if totals[k] < best[0]:
+                best[0] = float(totals[k])
+                best[1] = chosen + [int(us[k]), int(rest[k])]
+            return
+        left = remaining - cap_arr[us]
+        rest = np.floor(left / step - 1e-9).astype(np.intp)
+        np.minimum(rest, table.shape[1] - 1, out=rest)  # ufuncs: np.clip's overhead shows at this call rate
+        np.maximum(rest, 0, out=rest)
+        lower = cost + price_arr[us] + np.maximum(table[slots - 2][rest], left * per_kw[us])
+        for k in np.argsort(lower, kind="stable"):
+            if lower[k] >= best[0]:
+                break
+            u = int(us[k])
+            search(remaining - caps[u], slots - 1, u, cost + prices[u], chosen + [u])
+
+    if not caps:
+        return None
+    if required <= 0:
+        search(0.0, 1, len(caps) - 1, 0.0, [])
+    else:
+        search(required, max_units, len(caps) - 1, 0.0, [])
+    if best[1] is None:
+        return None
+    return best[0], best[1]
+
+
+class CapacityIndex:
+    """First-fit lookup over one capacity column.
+
+    Capacities are sorted once; for every sorted position the smallest catalog
+    position at or above it is precomputed, so first-fit in catalog order is a
+    single bisect even when the catalog is not sorted by capacity.
+    """
+
+    def __init__(self, capacities: Sequence[float]):
+        caps = np.asarray(capacities, dtype=np.float64)
+        order = np.argsort(caps, kind="stable")
+        self.capacities = caps
+        self.sorted_capacities = caps[order]
+        self.first_position = np.minimum.accumulate(order[::-1])[::-1]
+        self._sorted_list = self.sorted_capacities.tolist()
+
+    def __len__(self):
+        return len(self.capacities)
+
+    def first_fit(self, required: float) -> int:
+        """Catalog position of the first entry with capacity >= required, or -1 (also for NaN)."""
+        i = bisect.bisect_left(self._sorted_list, required)
+        if i == len(self._sorted_list) or required != required:
+            return -1
+        return int(self.first_position[i])
+
+    def first_fit_batch(self, required) -> np.ndarray:
+        """Vectorized `first_fit`; NaN or uncovered loads give -1."""
+        req = np.asarray(required, dtype=np.float64)
+        i = np.searchsorted(self.sorted_capacities, req, side="left")
+        found = i < len(self.capacities)
+        positions = np.append(self.first_position, -1)
+        return np.where(found, positions[np.minimum(i, len(self.capacities))], -1)
+
+
+def _first_fit_points(capacities: np.ndarray, required: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """First-fit catalog positions (-1 when none) at several operating points at once.
+
+    ``capacities`` is (models, points); ``required`` holds the loads of point
+    0, then point 1, ..., ``counts`` per point. Points with many loads get a
+    `CapacityIndex`; the rest are found by comparing against the whole
+    column, which is cheaper than sorting it for a handful of loads.
+    """
+    found = np.full(len(required), -1, dtype=np.intp)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+    indexed = counts >= INDEX_MIN_LOADS
+    for k in np.flatnonzero(indexed).tolist():
+        rows = slice(offsets[k], offsets[k + 1])
+        found[rows] = CapacityIndex(capacities[:, k]).first_fit_batch(required[rows])
+    point = np.repeat(np.arange(len(counts)), counts)
+    scanned = np.flatnonzero(~indexed[point])
+    step = max(1, (1 << 22) // max(1, len(capacities)))
+    for start in range(0, len(scanned), step):
+        rows = scanned[start:start + step]
+        fits = capacities[:, point[rows]] >= required[rows]
+        first = fits.argmax(axis=0)
+        found[rows] = np.where(fits[first, np.arange(len(rows))], first, -1)
+    return found
+
+
+class EquipmentCatalog:
+    """Compressor and evaporator catalogs with a capacity index per mode."""
+
+    def __init__(self, compressors: Sequence[Mapping[str, Any]] = COMPRESSOR_CATALOG,
+                 evaporators: Sequence[Mapping[str, Any]] = EVAPORATORS):
+        self.compressors = list(compressors)
+        self.evaporators = list(evaporators)
+        self.compressor_columns = {
+            key: np.array([c[key] for c in self.compressors], dtype=np.float64)
+            for key in MODES + ("power", "price")
+        }
+        self.evaporator_capacity = np.array([e["capacity"] for e in self.evaporators], dtype=np.float64)
+        self.evaporator_price = np.array([e["price"] for e in self.evaporators], dtype=np.float64)
+        self.compressor_index = {mode: CapacityIndex(self.compressor_columns[mode]) for mode in MODES}
+        self.evaporator_index = CapacityIndex(self.evaporator_capacity)
+        self._units = {}
+        self._bounds = {}
+        self._maps = None
+        self.operating_index = lru_cache(maxsize=256)(self._operating_index)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["operating_index"]  # per-instance lru_cache wrappers do not pickle
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.operating_index = lru_cache(maxsize=256)(self._operating_index)
+
+    def select(self, required: float, mode: str):
+        """Single-room selection exactly as in `calculate()`."""
+        c = self.compressor_index[mode].first_fit(required)
+        e = self.evaporator_index.first_fit(required)
+        return (self.compressors[c] if c >= 0 else None,
+                self.evaporators[e] if e >= 0 else None)
+
+    def select_batch(self, required, t_evap) -> Dict[str, np.ndarray]:
+        """First-fit catalog positions for many loads at once (-1 when not found)."""
+        req = np.asarray(required, dtype=np.float64)
+        with stage("selection", req.size):
+            low = np.broadcast_to(np.asarray(t_evap) < -15, req.shape)
+            compressor = np.empty(req.shape, dtype=np.intp)
+            compressor[low] = self.compressor_index["capLow"].first_fit_batch(req[low])
+            compressor[~low] = self.compressor_index["capMed"].first_fit_batch(req[~low])
+            evaporator = self.evaporator_index.first_fit_batch(req)
+        return {"compressor": compressor, "evaporator": evaporator}
+
+    @property
+    def maps(self) -> CompressorMaps:
+        """Polynomial capacity/power maps of the compressors, fitted on first use."""
+        if self._maps is None:
+            self._maps = CompressorMaps(self.compressors)
+        return self._maps
+
+    def _operating_index(self, t_evap: float, t_cond: float, refrigerant: str) -> CapacityIndex:
+        return CapacityIndex(self.maps.at(t_evap, t_cond, refrigerant)["capacity"])
+
+    def select_at(self, required: float, t_evap: float, t_cond: float, refrigerant: str = "R404A"):
+        """First-fit compressor rated at the real operating point, plus its capacity, power and EER.
+
+        Returns ``(compressor, evaporator, rating)``; ``rating`` is None when no
+        compressor is found.
+        """
+        point = (float(tenths(t_evap)) / 10, float(tenths(t_cond)) / 10, refrigerant)
+        c = self.operating_index(*point).first_fit(required)
+        e = self.evaporator_index.first_fit(required)
+        rating = None
+        if c >= 0:
+            rating = {k: float(v[c]) for k, v in self.maps.at(*point).items()}
+        return (self.compressors[c] if c >= 0 else None,
+                self.evaporators[e] if e >= 0 else None,
+                rating)
+
+    def select_at_batch(self, required, t_evap, t_cond, refrigerant="R404A") -> Dict[str, np.ndarray]:
+        """`select_at` for many loads.
+
+        Rows are grouped by operating point (rounded to 0.1 K by `tenths`, as
+        in `select_at`) once, and the distinct points are rated in chunks with
+        `CompressorMaps.rate`, bypassing the bounded per-point caches of the
+        scalar path.
+        """
+        req = np.asarray(required, dtype=np.float64)
+        te = np.broadcast_to(np.asarray(t_evap, dtype=np.float64), req.shape)
+        tc = np.broadcast_to(np.asarray(t_cond, dtype=np.float64), req.shape)
+        ref = np.broadcast_to(np.asarray(refrigerant), req.shape).ravel()
+        with stage("selection", req.size):
+            flat = req.ravel()
+            compressor = np.full(flat.shape, -1, dtype=np.intp)
+            capacity = np.full(flat.shape, np.nan)
+            power = np.full(flat.shape, np.nan)
+            # (Te, Tc) in tenths of a kelvin packed into one integer key per row
+            te10, tc10 = tenths(te.ravel()), tenths(tc.ravel())
+            valid = np.isfinite(te10) & np.isfinite(tc10)
+            keys = np.where(valid, te10, 0).astype(np.int64) << 32
+            keys |= np.where(valid, tc10, 0).astype(np.int64) & 0xFFFFFFFF
+            per_chunk = max(1, (1 << 22) // max(1, len(self.compressors)))
+            for name in np.unique(ref):
+                rows = np.flatnonzero((ref == name) & valid)
+                unique, inverse = np.unique(keys[rows], return_inverse=True)
+                rows = rows[np.argsort(inverse, kind="stable")]
+                offsets = np.concatenate(([0], np.cumsum(np.bincount(inverse, minlength=len(unique)))))
+                unique_te = (unique >> 32) / 10
+                unique_tc = (unique << 32 >> 32) / 10
+                for first in range(0, len(unique), per_chunk):
+                    last = min(first + per_chunk, len(unique))
+                    rated, rated_power = self.maps.rate(unique_te[first:last], unique_tc[first:last], str(name))
+                    part = rows[offsets[first]:offsets[last]]
+                    counts = np.diff(offsets[first:last + 1])
+                    found = _first_fit_points(rated, flat[part], counts)
+                    ok = found >= 0
+                    point = np.repeat(np.arange(last - first), counts)[ok]
+                    compressor[part] = found
+                    capacity[part[ok]] = rated[found[ok], point]
+                    power[part[ok]] = rated_power[found[ok], point]
+            evaporator = self.evaporator_index.first_fit_batch(req)
+        return {
+            "compressor": compressor.reshape(req.shape),
+            "evaporator": evaporator,
+            "capacity": capacity.reshape(req.shape),
+            "power": power.reshape(req.shape),
+            "eer": (capacity / power).reshape(req.shape),
+        }
+
+    def _unit_frontier(self, mode: str):
+        """Compressor + evaporator units on the capacity/price Pareto frontier.
+
+        Each compressor is paired with the cheapest evaporator that covers it
+        (or the largest evaporator when none does; the unit is then limited by
+        the evaporator). Units that cost more than a larger unit are dropped, so
+        along the frontier capacity and price both increase strictly.
+        """
+        if mode in self._units:
+            return self._units[mode]
+        comp_cap = self.compressor_columns[mode]
+        order = np.argsort(self.evaporator_capacity, kind="stable")
+        evap_cap = self.evaporator_capacity[order]
+        evap_price = self.evaporator_price[order]
+        # cheapest evaporator at or above each sorted position
+        suffix_pos = np.empty(len(order), dtype=np.intp)
+        best = len(order) - 1
+        for i in range(len(order) - 1, -1, -1):
+            if evap_price[i] <= evap_price[best]:
+                best = i
+            suffix_pos[i] = best
+        largest = suffix_pos[np.searchsorted(evap_cap, evap_cap[-1], side="left")]
+
+        i = np.searchsorted(evap_cap, comp_cap, side="left")
+        evap_sorted = np.where(i < len(order), suffix_pos[np.minimum(i, len(order) - 1)], largest)
+        capacity = np.minimum(comp_cap, evap_cap[evap_sorted])
+        price = self.compressor_columns["price"] + evap_price[evap_sorted]
+
+        keep = price_frontier(capacity, price)
+        frontier = {
+            "compressor": keep,
+            "evaporator": order[evap_sorted[keep]],
+            "capacity": capacity[keep].tolist(),
+            "price": price[keep].tolist(),
+        }
+        self._units[mode] = frontier
+        return frontier
+
+    def _cost_bounds(self, mode: str, max_units: int, steps: int = 4096):
+        key = (mode, max_units, steps)
+        if key not in self._bounds:
+            units = self._unit_frontier(mode)
+            self._bounds[key] = cost_lower_bounds(units["capacity"], units["price"], max_units, steps)
+        return self._bounds[key]
+
+    def cheapest_combination(self, required: float, mode: str, max_units: int = 4) -> Optional[Dict[str, Any]]:
+        """Cheapest set of up to ``max_units`` compressor + evaporator units covering ``required``.
+
+        Searches the capacity/price Pareto frontier of units with
+        `cheapest_cover`. Returns None when even ``max_units`` of the largest
+        unit fall short.
+        """
+        units = self._unit_frontier(mode)
+        caps = units["capacity"]
+        if not caps or required != required:
+            return None
+        found = cheapest_cover(caps, units["price"], self._cost_bounds(mode, max_units), required, max_units)
+        if found is None:
+            return None
+        price, chosen = found
+        return {
+            "compressors": [self.compressors[units["compressor"][u]] for u in chosen],
+            "evaporators": [self.evaporators[units["evaporator"][u]] for u in chosen],
+            "capacity": sum(caps[u] for u in chosen),
+            "price": price,
+        }
+
+    def cheapest_combinations(self, required, t_evap, max_units: int = 4) -> List[Optional[Dict[str, Any]]]:
+        """`cheapest_combination` for many loads; identical (load, mode) pairs are solved once."""
+        req = np.asarray(required, dtype=np.float64).ravel()
+        modes = np.broadcast_to(compressor_mode(t_evap), req.shape)
+        solved = {}
+        out = []
+        with stage("combination", req.size):
+            for r, m in zip(req.tolist(), modes.tolist()):
+                key = (r, m)
+                if key not in solved:
+                    solved[key] = self.cheapest_combination(r, m, max_units)
+                out.append(solved[key])
+        return out
@@ -0,0 +1,329 @@
+"""Asyncio sizing service around `calculate()` and `get_warnings()`.
+
+Endpoints (JSON in and out):
+
+    POST /size          one room's form inputs -> result with warnings
+    POST /size/batch    list of rooms -> list of results
+    POST /catalog       {"compressors": [...], "evaporators": [...]} replaces the catalog
+    GET  /metrics       request and cache counters
+
+Inputs are normalized to the form's step sizes before sizing, and results
+are kept in an LRU cache with a TTL keyed on the normalized inputs. Replacing
+the catalog clears the cache. `LocalClient` drives the same dispatch in
+process, without sockets. Run with ``python -m refcalc.service --port 8080``.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .data import DEFAULT_INPUTS, PRODUCT_DATA, U_VALUES
+from .loads import calculate, get_warnings
+from .refrigerant import REFRIGERANTS
+from .selection import EquipmentCatalog
+
+# rounding applied to each input, matching the form controls (None keeps the value)
+INPUT_STEPS = {
+    "length": 1,
+    "width": 1,
+    "height": 1,
+    "insulation": 0,
+    "tempAmbient": None,
+    "tempInternal": None,
+    "productLoad": None,
+    "productTemp": None,
+    "tEvap": 0,
+    "tCond": 0,
+    "runHours": 0,
+}
+
+MAX_BODY = 16 * 1024 * 1024
+
+# numeric keys every catalog entry must carry
+COMPRESSOR_KEYS = ("capLow", "capMed", "power", "price")
+EVAPORATOR_KEYS = ("capacity", "price")
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def normalize(inputs: Mapping[str, Any]) -> Dict[str, Any]:
+    """Form inputs completed with defaults, rounded to the form's steps and validated."""
+    if not isinstance(inputs, Mapping):
+        raise BadRequest("room inputs must be a JSON object")
+    unknown = set(inputs) - set(DEFAULT_INPUTS)
+    if unknown:
+        raise BadRequest(f"unknown inputs: {', '.join(sorted(unknown))}")
+    p = dict(DEFAULT_INPUTS)
+    p.update(inputs)
+    for name, digits in INPUT_STEPS.items():
+        if isinstance(p[name], bool):
+            raise BadRequest(f"{name} must be a number")
+        try:
+            value = float(p[name])
+        except (TypeError, ValueError):
+            raise BadRequest(f"{name} must be a number") from None
+        if value != value or value in (float("inf"), float("-inf")):
+            raise BadRequest(f"{name} must be finite")
+        if digits == 0:
+            value = int(round(value))
+        elif digits is not None:
+            value = round(value, digits)
+        p[name] = value
+    for name in ("productType", "refrigerant"):
+        if not isinstance(p[name], str):
+            raise BadRequest(f"{name} must be a string")
+    if p["insulation"] not in U_VALUES:
+        raise BadRequest(f"insulation must be one of {sorted(U_VALUES)}")
+    if p["productType"] not in PRODUCT_DATA:
+        raise BadRequest(f"productType must be one of {sorted(PRODUCT_DATA)}")
+    if p["refrigerant"] not in REFRIGERANTS:
+        raise BadRequest(f"refrigerant must be one of {sorted(REFRIGERANTS)}")
+    if min(p["length"], p["width"], p["height"]) <= 0 or p["runHours"] <= 0:
+        raise BadRequest("dimensions and runHours must be positive")
+    return p
+
+
+def _check_catalog(name: str, entries: Any, keys: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """``entries`` as a list of catalog dicts, or BadRequest naming the first problem."""
+    if not isinstance(entries, list) or not entries:
+        raise BadRequest(f"{name} must be a non-empty list")
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, Mapping):
+            raise BadRequest(f"{name}[{i}] must be an object")
+        if not isinstance(entry.get("model"), str):
+            raise BadRequest(f"{name}[{i}].model must be a string")
+        for key in keys:
+            value = entry.get(key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise BadRequest(f"{name}[{i}].{key} must be a finite number")
+    return [dict(entry) for entry in entries]
+
+
+class ResultCache:
+    """LRU cache whose entries also expire ``ttl`` seconds after insertion."""
+
+    def __init__(self, maxsize: int = 100_000, ttl: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SizingService:
+    """Sizing logic, cache and request dispatch; transport-independent."""
+
+    def __init__(self, catalog: Optional[EquipmentCatalog] = None, cache_size: int = 100_000,
+                 ttl: float = 3600.0, max_units: int = 4):
+        self.catalog = catalog or EquipmentCatalog()
+        self.cache = ResultCache(cache_size, ttl)
+        self.max_units = max_units
+        self.catalog_version = 0
+        self.requests = 0
+        self.errors = 0
+        self.rooms = 0
+
+    def size(self, inputs: Mapping[str, Any]) -> Dict[str, Any]:
+        """Sized room for one set of form inputs, from the cache when possible.
+
+        When no single compressor or no single evaporator fits,
+        ``combination`` holds the cheapest multi-unit set from `EquipmentCatalog.cheapest_combination`. The
+        returned dict is shared with the cache and must not be modified.
+        """
+        p = normalize(inputs)
+        key = tuple(p[k] for k in DEFAULT_INPUTS)
+        self.rooms += 1
+        result = self.cache.get(key)
+        if result is None:
+            result = calculate(p, self.catalog.compressors, self.catalog.evaporators)
+            result["warnings"] = get_warnings(p, result)
+            result["combination"] = None
+            if result["selectedCompressor"] is None or result["selectedEvaporator"] is None:
+                result["combination"] = self.catalog.cheapest_combination(
+                    result["requiredCapacity"], result["mode"], self.max_units)
+            result["inputs"] = p
+            self.cache.put(key, result)
+        return result
+
+    def size_batch(self, rooms: List[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+        if not isinstance(rooms, list):
+            raise BadRequest("batch body must be a JSON list of rooms")
+        return [self.size(room) for room in rooms]
+
+    def update_catalog(self, compressors=None, evaporators=None):
+        """Replace the compressor and/or evaporator catalog and drop every cached result.
+
+        Raises BadRequest unless each given catalog is a non-empty list of
+        entries with a ``model`` and the numeric COMPRESSOR_KEYS/EVAPORATOR_KEYS.
+        """
+        if compressors is not None:
+            compressors = _check_catalog("compressors", compressors, COMPRESSOR_KEYS)
+        if evaporators is not None:
+            evaporators = _check_catalog("evaporators", evaporators, EVAPORATOR_KEYS)
+        self.catalog = EquipmentCatalog(compressors if compressors is not None else self.catalog.compressors,
+                                        evaporators if evaporators is not None else self.catalog.evaporators)
+        self.catalog_version += 1
+        self.cache.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rooms": self.rooms,
+            "catalogVersion": self.catalog_version,
+            "cache": self.cache.stats(),
+        }
+
+    def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """Route one request; returns ``(status, payload)``."""
+        self.requests += 1
+        try:
+            if method == "GET" and path == "/metrics":
+                return 200, self.metrics()
+            if method != "POST" or path not in ("/size", "/size/batch", "/catalog"):
+                return 404, {"error": f"no route for {method} {path}"}
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError:
+                raise BadRequest("body is not valid JSON") from None
+            if path == "/size":
+                return 200, self.size(payload)
+            if path == "/size/batch":
+                return 200, self.size_batch(payload)
+            if not isinstance(payload, Mapping):
+                raise BadRequest("catalog body must be a JSON object")
+            self.update_catalog(payload.get("compressors"), payload.get("evaporators"))
+            return 200, {"catalogVersion": self.catalog_version}
+        except BadRequest as exc:
+            self.errors += 1
+            return 400, {"error": str(exc)}
+        except Exception as exc:
+            self.errors += 1
+            return 500, {"error": f"internal error: {type(exc).__name__}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal HTTP/1.1 with keep-alive: enough for JSON clients and load balancers."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": "request body too large"}
+                    body = b""
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = self.dispatch(method, path.split("?", 1)[0], body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and not version.startswith("HTTP/1.0") and status != 413)
+                writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json; charset=utf-8\r\n"
+                             b"Content-Length: %d\r\nConnection: %s\r\n\r\n"
+                             % (status, _REASONS.get(status, b"OK"), len(data),
+                                b"keep-alive" if keep_alive else b"close"))
+                writer.write(data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+_REASONS = {200: b"OK", 400: b"Bad Request", 404: b"Not Found", 413: b"Payload Too Large",
+            500: b"Internal Server Error"}
+
+
+class LocalClient:
+    """In-process client: JSON round trip through `SizingService.dispatch`, no network."""
+
+    def __init__(self, service: Optional[SizingService] = None):
+        self.service = service or SizingService()
+
+    async def request(self, method: str, path: str, payload: Any = None) -> Tuple[int, Any]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        status, result = self.service.dispatch(method, path, body)
+        return status, json.loads(json.dumps(result, ensure_ascii=False))
+
+    async def post(self, path: str, payload: Any) -> Tuple[int, Any]:
+        return await self.request("POST", path, payload)
+
+    async def get(self, path: str) -> Tuple[int, Any]:
+        return await self.request("GET", path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refrigeration sizing service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-size", type=int, default=100_000)
+    parser.add_argument("--ttl", type=float, default=3600.0)
+    args = parser.parse_args(argv)
+    service = SizingService(cache_size=args.cache_size, ttl=args.ttl)
+
+    async def run():
+        server = await service.serve(args.host, args.port)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
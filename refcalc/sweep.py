@@ -0,0 +1,236 @@
+"""Parametric sweeps over the `calculate()` inputs.
+
+A `Sweep` is the Cartesian product of a few input axes on top of a base room.
+Points are addressed by their flat index, so the grid is never materialized:
+each chunk of indices is unraveled, sized with `calculate_batch`, matched
+against the catalog and written to its own part file by a worker process.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from . import profiling
+from .data import DEFAULT_INPUTS
+from .loads import calculate_batch
+from .selection import EquipmentCatalog
+
+RESULT_COLUMNS = ("qTransmission", "qProduct", "qAdditional", "requiredCapacity")
+
+
+def frange(start: float, stop: float, step: float) -> np.ndarray:
+    """Inclusive numeric range, e.g. ``frange(12, 24, 1)`` for runHours."""
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return start + np.arange(count) * step
+
+
+class Sweep:
+    """Cartesian grid over ``axes`` (input name -> values) around ``base`` inputs.
+
+    With ``operating_point`` compressors are rated through the catalog's
+    polynomial maps at each point's tEvap/tCond/refrigerant, and an ``eer``
+    column is added.
+    """
+
+    def __init__(self, axes: Mapping[str, Sequence[Any]], base: Optional[Mapping[str, Any]] = None,
+                 catalog: Optional[EquipmentCatalog] = None, operating_point: bool = False):
+        unknown = set(axes) - set(DEFAULT_INPUTS)
+        if unknown:
+            raise ValueError(f"unknown sweep inputs: {sorted(unknown)}")
+        self.axes = {name: np.asarray(values) for name, values in axes.items()}
+        self.base = dict(DEFAULT_INPUTS)
+        if base:
+            self.base.update(base)
+        self.catalog = catalog or EquipmentCatalog()
+        self.operating_point = operating_point
+        self.names = list(self.axes)
+        self.shape = tuple(len(v) for v in self.axes.values())
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+        self.strides = [int(np.prod(self.shape[i + 1:], dtype=np.int64)) for i in range(len(self.shape))]
+
+    def columns(self, flat: np.ndarray) -> Dict[str, Any]:
+        """Input columns for the given flat grid indices."""
+        columns = dict(self.base)
+        for name, idx in zip(self.names, np.unravel_index(flat, self.shape)):
+            columns[name] = self.axes[name][idx]
+        return columns
+
+    def evaluate(self, flat: np.ndarray) -> Dict[str, np.ndarray]:
+        """Loads, selected catalog positions and total price at the given points."""
+        columns = self.columns(flat)
+        loads = {k: np.broadcast_to(v, flat.shape) for k, v in calculate_batch(columns).items()}
+        required = loads["requiredCapacity"]
+        if self.operating_point:
+            selected = self.catalog.select_at_batch(required, columns["tEvap"], columns["tCond"], columns["refrigerant"])
+        else:
+            selected = self.catalog.select_batch(required, np.broadcast_to(columns["tEvap"], flat.shape))
+        comp_price = np.append(self.catalog.compressor_columns["price"], np.nan)[selected["compressor"]]
+        evap_price = np.append(self.catalog.evaporator_price, 0.0)[selected["evaporator"]]
+        out = {name: np.broadcast_to(columns[name], flat.shape) for name in self.names}
+        out.update((name, loads[name]) for name in RESULT_COLUMNS)
+        out["compressor"] = selected["compressor"]
+        out["evaporator"] = selected["evaporator"]
+        out["totalPrice"] = comp_price + evap_price
+        if self.operating_point:
+            out["eer"] = selected["eer"]
+        return out
+
+    def switches(self, flat: np.ndarray, result: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Points whose next grid neighbour along some axis selects different equipment.
+
+        Neighbours that fall outside ``flat`` (a contiguous index range) are
+        re-evaluated, so each chunk can be processed on its own.
+        """
+        start, stop = int(flat[0]), int(flat[-1]) + 1
+        positions = np.unravel_index(flat, self.shape)
+        found = {"index": [], "axis": [], "at": [], "next": [], "component": [], "from": [], "to": []}
+        for a, (name, stride) in enumerate(zip(self.names, self.strides)):
+            has_next = positions[a] < self.shape[a] - 1
+            here = flat[has_next]
+            there = here + stride
+            inside = there < stop
+            neighbour = {}
+            for component in ("compressor", "evaporator"):
+                values = np.empty(len(there), dtype=np.intp)
+                values[inside] = result[component][there[inside] - start]
+                neighbour[component] = values
+            if not inside.all():
+                outside = self.evaluate(there[~inside])
+                for component in neighbour:
+                    neighbour[component][~inside] = outside[component]
+            for component in ("compressor", "evaporator"):
+                before = result[component][here - start]
+                changed = before != neighbour[component]
+                found["index"].append(here[changed])
+                found["axis"].append(np.full(changed.sum(), a, dtype=np.intp))
+                step = positions[a][has_next][changed]
+                found["at"].append(self.axes[name][step].astype(object))
+                found["next"].append(self.axes[name][step + 1].astype(object))
+                found["component"].append(np.full(changed.sum(), component))
+                found["from"].append(before[changed])
+                found["to"].append(neighbour[component][changed])
+        return {k: np.concatenate(v) for k, v in found.items()}
+
+    def one_at_a_time(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Sensitivity of the base room: each axis varied alone, the others held at ``base``."""
+        out = {}
+        for name in self.names:
+            single = Sweep({name: self.axes[name]}, self.base, self.catalog, self.operating_point)
+            out[name] = single.evaluate(np.arange(single.size))
+        return out
+
+    def run(self, directory: str, chunk_size: int = 1 << 18, workers: Optional[int] = None,
+            fmt: str = "csv", find_switches: bool = True) -> Dict[str, Any]:
+        """Evaluate the whole grid into part files under ``directory``.
+
+        Each chunk writes ``part-NNNNNN.<fmt>`` (and ``switches-NNNNNN.<fmt>``)
+        itself, so memory stays at a few chunks per worker whatever the grid
+        size. ``workers=0`` runs in-process. Returns point and switch counts.
+        """
+        if fmt not in _WRITERS:
+            raise ValueError(f"unknown output format {fmt!r}")
+        os.makedirs(directory, exist_ok=True)
+        tasks = [(i, start, min(start + chunk_size, self.size))
+                 for i, start in enumerate(range(0, self.size, chunk_size))]
+        summary = {"points": 0, "chunks": 0, "switches": 0}
+
+        def collect(counts):
+            summary["points"] += counts[0]
+            summary["switches"] += counts[1]
+            summary["chunks"] += 1
+
+        if workers == 0:
+            for task in tasks:
+                collect(_run_chunk(self, directory, fmt, find_switches, *task))
+            return summary
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(self, directory, fmt, find_switches, profiling.enabled())) as pool:
+            pending = []
+            for task in tasks:
+                pending.append(pool.submit(_run_worker_chunk, *task))
+                if len(pending) >= 2 * workers:
+                    collect(_worker_result(pending.pop(0)))
+            for future in pending:
+                collect(_worker_result(future))
+        return summary
+
+
+def _write_csv(path: str, columns: Mapping[str, np.ndarray]):
+    # one %-format per row is about twice as fast as csv.writer; floats keep 10 significant digits
+    values = [np.asarray(v) for v in columns.values()]
+    row = ",".join("%d" if v.dtype.kind in "iu" else "%.10g" if v.dtype.kind == "f" else "%s" for v in values)
+    row += "\n"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(columns) + "\n")
+        f.write("".join([row % r for r in zip(*(v.tolist() for v in values))]))
+
+
+def _write_parquet(path: str, columns: Mapping[str, np.ndarray]):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("parquet output requires pyarrow") from exc
+    pq.write_table(pa.table({k: np.asarray(v) for k, v in columns.items()}), path)
+
+
+_WRITERS = {"csv": _write_csv, "parquet": _write_parquet}
+
+
+def _model_names(models: Sequence[Mapping[str, Any]], positions: np.ndarray) -> np.ndarray:
+    names = np.array([m["model"] for m in models] + [""], dtype=object)
+    return names[positions]
+
+
+def _run_chunk(sweep: Sweep, directory: str, fmt: str, find_switches: bool, number: int, start: int, stop: int):
+    write = _WRITERS[fmt]
+    flat = np.arange(start, stop, dtype=np.int64)
+    result = sweep.evaluate(flat)
+    table = dict(result)
+    table["compressor"] = _model_names(sweep.catalog.compressors, result["compressor"])
+    table["evaporator"] = _model_names(sweep.catalog.evaporators, result["evaporator"])
+    write(os.path.join(directory, f"part-{number:06d}.{fmt}"), {"index": flat, **table})
+    found = 0
+    if find_switches:
+        switches = sweep.switches(flat, result)
+        found = len(switches["index"])
+        if found:
+            compressor = switches["component"] == "compressor"
+            names = {}
+            for end in ("from", "to"):
+                names[end] = np.empty(found, dtype=object)
+                names[end][compressor] = _model_names(sweep.catalog.compressors, switches[end][compressor])
+                names[end][~compressor] = _model_names(sweep.catalog.evaporators, switches[end][~compressor])
+            axis_names = np.array(sweep.names, dtype=object)[switches["axis"]]
+            write(os.path.join(directory, f"switches-{number:06d}.{fmt}"), {
+                "index": switches["index"],
+                "axis": axis_names,
+                "at": switches["at"],
+                "next": switches["next"],
+                "component": switches["component"],
+                "from": names["from"],
+                "to": names["to"],
+            })
+    return stop - start, found
+
+
+_worker_state = None
+
+
+def _init_worker(sweep: Sweep, directory: str, fmt: str, find_switches: bool, profile: bool):
+    global _worker_state
+    _worker_state = (sweep, directory, fmt, find_switches)
+    profiling.init_worker(profile)
+
+
+def _run_worker_chunk(number: int, start: int, stop: int):
+    return _run_chunk(*_worker_state, number, start, stop), profiling.drain()
+
+
+def _worker_result(future):
+    counts, stats = future.result()
+    profiling.merge(stats)
+    return counts
@@ -0,0 +1,72 @@
+import csv
+
+import numpy as np
+import pytest
+
+from refcalc import iter_weather_array, iter_weather_csv, simulate
+
+
+def write_weather(path, hours_by_site):
+    with open(path, "w") as f:
+        f.write("site,temp\n")
+        for site, hours in hours_by_site.items():
+            for h in range(hours):
+                f.write(f"{site},{20 + 10 * np.sin(h / 24):.2f}\n")
+
+
+def test_numeric_room_sites_match_csv_sites(tmp_path):
+    path = tmp_path / "weather.csv"
+    write_weather(path, {101: 48, 202: 48})
+    rooms = {"site": np.array([202, 101, 101]), "length": np.array([3.0, 4.0, 5.0])}
+    result = simulate(rooms, iter_weather_csv(str(path), chunk_sites=1))
+    assert not np.isnan(result["annualKwh"]).any()
+    same = simulate(rooms, iter_weather_array(np.array(next(iter_weather_csv(str(path)))[1]), sites=[101, 202]))
+    assert result["annualKwh"].tolist() == same["annualKwh"].tolist()
+
+
+def test_unequal_hour_counts_are_rejected(tmp_path):
+    path = tmp_path / "weather.csv"
+    write_weather(path, {"a": 48, "b": 47})
+    with pytest.raises(ValueError, match="'b' has 47 hours, expected 48"):
+        list(iter_weather_csv(str(path)))
+
+
+def test_weather_without_any_room_site_is_rejected():
+    rooms = {"site": np.array(["x", "y"])}
+    with pytest.raises(ValueError, match="no room's site"):
+        simulate(rooms, iter_weather_array(np.full((2, 24), 30.0), sites=["a", "b"]))
+
+
+def reference_parse(path):
+    series = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            series.setdefault(row.get("site"), []).append(float(row["temp"]))
+    return series
+
+
+@pytest.mark.parametrize("block_rows", [1, 5, 48, 1 << 16])
+def test_weather_csv_blocks_parse_like_csv(tmp_path, block_rows):
+    path = tmp_path / "weather.csv"
+    with open(path, "w") as f:
+        f.write('hour,site,temp\n')
+        for site in ("101", '"Tbilisi, GE"', "#3", " x "):
+            for h in range(24):
+                f.write(f"{h},{site},{h * 0.5 - 3:.2f}\n")
+                if h == 10:
+                    f.write("\n")
+        f.write("\n\n")
+    expected = reference_parse(path)
+    chunks = list(iter_weather_csv(str(path), chunk_sites=3, block_rows=block_rows))
+    assert [len(sites) for sites, _ in chunks] == [3, 1]
+    got = {site: row.tolist() for sites, temps in chunks for site, row in zip(sites, temps)}
+    assert got == expected
+    assert list(got) == ["101", "Tbilisi, GE", "#3", " x "]
+
+
+def test_weather_csv_without_site_column_is_one_site(tmp_path):
+    path = tmp_path / "tbilisi.csv"
+    path.write_text("temp\n" + "".join(f"{t}\n" for t in range(30)))
+    (sites, temps), = iter_weather_csv(str(path), block_rows=7)
+    assert sites == ["tbilisi"]
+    assert temps.tolist() == [list(map(float, range(30)))]
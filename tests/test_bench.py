@@ -0,0 +1,8 @@
+import pytest
+
+from refcalc.bench import check_golden
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_golden_values_and_batch_scalar_agreement(seed):
+    assert check_golden(rooms=200, seed=seed) == []
@@ -0,0 +1,60 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from refcalc.facility import HOURS_PER_YEAR, RackSolver, optimize_facility, pack_racks
+from refcalc.selection import EquipmentCatalog
+
+
+@pytest.fixture(scope="module")
+def columns():
+    return EquipmentCatalog().compressor_columns
+
+
+@pytest.mark.parametrize("mode", ["capLow", "capMed"])
+def test_rack_solver_is_within_two_percent_of_brute_force(columns, mode):
+    solver = RackSolver(columns[mode], columns["price"], columns["power"], max_units=6)
+    combos = [list(c) for k in range(1, 7)
+              for c in itertools.combinations_with_replacement(range(len(solver.capacity)), k)]
+    counts = np.zeros((len(combos), len(solver.capacity)))
+    for row, combo in enumerate(combos):
+        np.add.at(counts[row], combo, 1)
+    capacity, price, power = counts @ solver.capacity, counts @ solver.price, counts @ solver.power
+    # includes loads where linearizing at the required capacity alone was up to 10 % off
+    for required in (0.5, 2.53, 2.62, 4.55, 6.58, 10.63, 12.65, 16.39, 41.0, 6 * solver.largest):
+        for years in (0.0, 1.0, 50.0):
+            weight = 0.15 * years * HOURS_PER_YEAR * 0.7 * required
+            feasible = capacity >= required
+            best = (price + weight * power / capacity)[feasible].min()
+            assert solver.cost(solver.solve(required, weight), weight) <= 1.02 * best
+
+
+def test_chamber_with_unknown_load_is_unserved():
+    result = optimize_facility({"length": np.array([3.0, 4.0]), "productType": np.array(["meat", "ice"])}, workers=0)
+    assert result["unserved"] == [1]
+    assert [r["chambers"] for r in result["racks"]] == [[0]]
+    assert np.isfinite(result["totalCost"])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pack_racks_never_exceeds_the_limit(seed):
+    loads = np.random.default_rng(seed).uniform(0.1, 10.0, 200)
+    racks = pack_racks(loads, 12.5)
+    assert sorted(i for rack in racks for i in rack) == list(range(200))
+    assert all(loads[rack].sum() <= 12.5 for rack in racks)
+
+
+def test_chamber_larger_than_a_full_rack_is_unserved():
+    chambers = {"length": np.array([4.0, 60.0, 5.0]), "width": np.array([3.0, 40.0, 3.0]),
+                "height": np.array([3.0, 8.0, 3.0])}
+    result = optimize_facility(chambers, max_units=2, workers=0)
+    assert result["unserved"] == [1]
+    assert sorted(i for rack in result["racks"] for i in rack["chambers"]) == [0, 2]
+
+
+def test_workers_match_in_process():
+    rng = np.random.default_rng(3)
+    chambers = {"length": rng.uniform(3, 15, 40), "tempInternal": rng.choice([-25.0, -18.0, 2.0, 4.0], 40),
+                "tEvap": rng.choice([-35.0, -10.0], 40)}
+    assert optimize_facility(chambers, workers=2) == optimize_facility(chambers, workers=0)
@@ -0,0 +1,19 @@
+import numpy as np
+
+from refcalc import calculate, calculate_batch
+from refcalc.loads import Q_PEOPLE, steady_loads
+
+ROOMS = [
+    {"length": 4.0, "width": 3.0, "height": 2.5, "insulation": 100, "tempInternal": -20.0, "tempAmbient": 35.0},
+    {"length": 12.0, "width": 8.0, "height": 4.0, "insulation": 150, "tempInternal": 2.0, "tempAmbient": 30.0},
+]
+
+
+def test_steady_loads_match_calculate():
+    design = calculate_batch({k: np.array([room[k] for room in ROOMS]) for k in ROOMS[1]})
+    conductance, internal = steady_loads(design)
+    for i, room in enumerate(ROOMS):
+        expected = calculate(room)
+        assert np.isclose(conductance[i] * expected["deltaT"] + internal[i],
+                          expected["qTransmission"] + expected["qAdditional"])
+        assert np.isclose(internal[i] - Q_PEOPLE, 5 * expected["volume"] / 1000)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from refcalc import CompressorMaps, EquipmentCatalog, calculate
+from refcalc.data import COMPRESSOR_CATALOG
+
+
+def test_maps_reproduce_catalog_ratings():
+    maps = CompressorMaps()
+    assert maps.at(-10, 45)["capacity"].tolist() == [c["capMed"] for c in COMPRESSOR_CATALOG]
+    assert maps.at(-30, 45)["capacity"].tolist() == [c["capLow"] for c in COMPRESSOR_CATALOG]
+    assert maps.at(-10, 45)["power"].tolist() == [c["power"] for c in COMPRESSOR_CATALOG]
+
+
+def test_at_matches_evaluate_bit_for_bit():
+    maps = CompressorMaps()
+    te, tc = np.array([-35.0, -22.5, -10.0, -3.2]), np.array([30.0, 41.0, 45.0, 52.7])
+    for refrigerant in ("R404A", "R449A"):
+        table = maps.evaluate(te, tc, refrigerant)
+        for k in range(len(te)):
+            point = maps.at(te[k], tc[k], refrigerant)
+            for key in ("capacity", "power", "eer"):
+                assert point[key].tolist() == table[key][:, k].tolist()
+
+
+def test_rating_point_selection_matches_catalog_columns():
+    catalog = EquipmentCatalog()
+    for t_evap in (-10, -30):
+        for required in np.linspace(0.1, 22.0, 400).tolist():
+            rated, _, _ = catalog.select_at(required, t_evap, 45)
+            plain, _ = catalog.select(required, "capMed" if t_evap == -10 else "capLow")
+            assert rated is plain
+    compressor, _, rating = catalog.select_at(19.98, -10, 45)
+    assert compressor["model"] == "4PES-12Y"
+    assert rating["capacity"] == 20.0
+
+
+def test_calculate_with_maps_at_rating_point():
+    maps = EquipmentCatalog().maps
+    for length in (3.0, 8.0, 15.0):
+        room = {"length": length, "tEvap": -10, "tCond": 45}
+        assert calculate(room, maps=maps)["selectedCompressor"] is calculate(room)["selectedCompressor"]
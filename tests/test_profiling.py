@@ -0,0 +1,46 @@
+import pytest
+
+from refcalc import profiling
+from refcalc.reports import render_reports
+from refcalc.sweep import Sweep
+
+
+@pytest.fixture
+def profiled():
+    was_enabled = profiling.enabled()
+    profiling.reset()
+    profiling.enable()
+    yield
+    profiling.reset()
+    if not was_enabled:
+        profiling.disable()
+
+
+def test_merge_adds_drained_counters():
+    profiling.reset()
+    profiling.merge({"report": [1, 10, 500]})
+    profiling.merge({"report": [2, 5, 100], "sizing": [1, 10, 50]})
+    assert profiling.drain() == {"report": [3, 15, 600], "sizing": [1, 10, 50]}
+    assert profiling.snapshot() == {}
+
+
+def test_report_worker_counters_reach_the_parent(profiled):
+    rooms = [{"id": i, "length": 3 + i} for i in range(7)]
+    reports = list(render_reports(rooms, workers=2, chunk_size=3))
+    assert len(reports) == 7
+    stats = profiling.snapshot()
+    assert stats["report"]["calls"] == 3
+    assert stats["report"]["items"] == 7
+    assert stats["sizing"]["items"] == 7
+
+
+def test_sweep_worker_counters_reach_the_parent(profiled, tmp_path):
+    sweep = Sweep({"length": [3.0, 4.0, 5.0, 6.0], "tempInternal": [-20.0, 2.0]})
+    sweep.run(str(tmp_path), chunk_size=3, workers=2)
+    assert profiling.snapshot()["selection"]["items"] >= sweep.size
+
+
+def test_disabled_workers_send_nothing(profiled):
+    profiling.disable()
+    list(render_reports([{"length": 4.0}], workers=1))
+    assert profiling.snapshot() == {}
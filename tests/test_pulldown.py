@@ -0,0 +1,21 @@
+import numpy as np
+
+from refcalc.pulldown import simulate_pulldown
+
+
+def test_room_already_within_tolerance_reports_its_initial_load():
+    rooms = {"productTemp": np.array([1.0, 20.0]), "tempInternal": np.array([2.0, 2.0]),
+             "productLoad": np.array([500.0, 500.0])}
+    result = simulate_pulldown(rooms, capacity=50.0)
+    assert result["pulldownHours"][0] == 0.0
+    assert result["energyRemovedKwh"][0] == 0.0
+    assert result["peakLoad"][0] > 0.0
+    assert result["peakLoad"][1] > result["peakLoad"][0]
+
+
+def test_peak_load_is_at_least_the_initial_load():
+    rooms = {"productTemp": np.array([30.0]), "tempInternal": np.array([-18.0]), "productLoad": np.array([1000.0])}
+    single = simulate_pulldown(rooms, capacity=50.0, max_hours=0.0)
+    full = simulate_pulldown(rooms, capacity=50.0)
+    assert single["peakLoad"][0] > 0.0
+    assert full["peakLoad"][0] >= single["peakLoad"][0]
@@ -0,0 +1,52 @@
+import pytest
+
+from refcalc.reports import BASIC_TEMPLATE, ReportTemplate, render_reports, size_rooms, to_fixed
+
+
+@pytest.mark.parametrize("value, digits, expected", [
+    (12.25, 1, "12.3"),
+    (-12.25, 1, "-12.3"),
+    (0.125, 2, "0.13"),
+    (2.5, 0, "3"),
+    (1.45, 1, "1.4"),
+    (1.005, 2, "1.00"),
+    (-0.0, 1, "0.0"),
+    (-0.04, 1, "-0.0"),
+    (15, 1, "15.0"),
+    (float("nan"), 2, "NaN"),
+    (float("inf"), 2, "Infinity"),
+])
+def test_to_fixed_matches_javascript(value, digits, expected):
+    assert to_fixed(value, digits) == expected
+
+
+def test_basic_report_rounds_like_download_report():
+    room = next(size_rooms([{"length": 3.5, "width": 3.5, "height": 1.0}]))
+    assert "მოცულობა: 12.3 მ³\n" in ReportTemplate(BASIC_TEMPLATE).render(room)
+
+
+def test_workers_size_and_render_like_in_process():
+    rooms = [{"id": "small"}, {"length": 30, "width": 20, "height": 6, "productLoad": 20000}, {"tempInternal": 40}]
+    in_process = list(render_reports(rooms, workers=0, chunk_size=2))
+    assert [name for name, _ in in_process] == ["report_small.txt", "report_1.txt", "report_2.txt"]
+    assert list(render_reports(rooms, workers=1, chunk_size=2)) == in_process
+
+
+def test_room_without_a_single_evaporator_reports_the_combination():
+    room = next(size_rooms([{"length": 26, "width": 10, "height": 4}]))
+    assert room["selectedEvaporator"] is None
+    text = ReportTemplate().render(room)
+    assert "გამაორთქლებელი: ვერ მოიძებნა" not in text
+    assert " + ".join(e["model"] for e in room["combination"]["evaporators"]) in text
+
+
+def test_combination_lines_are_priced_separately():
+    room = next(size_rooms([{"length": 30, "width": 20, "height": 6, "productLoad": 20000}]))
+    combination = room["combination"]
+    compressors = sum(c["price"] for c in combination["compressors"])
+    evaporators = sum(e["price"] for e in combination["evaporators"])
+    assert compressors + evaporators == combination["price"]
+    lines = ReportTemplate().render(room).splitlines()
+    assert lines[9].startswith("კომპრესორი: BITZER ") and lines[9].endswith(f" - ${compressors}")
+    assert lines[10].startswith("გამაორთქლებელი: ") and lines[10].endswith(f" - ${evaporators}")
+    assert lines[11] == f"სულ: ${compressors + evaporators}"
@@ -0,0 +1,120 @@
+import itertools
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from refcalc import CapacityIndex, EquipmentCatalog
+from refcalc.bench import synthetic_catalog
+from refcalc.selection import cheapest_cover, cost_lower_bounds, price_frontier
+
+
+def test_catalog_pickles_with_warm_caches():
+    catalog = EquipmentCatalog()
+    expected = catalog.select_at(1.0, -10, 45)
+    catalog.maps.at(-5, 40)
+    copy = pickle.loads(pickle.dumps(catalog))
+    assert copy.select_at(1.0, -10, 45) == expected
+    assert copy.maps.at(-5, 40)["capacity"].tolist() == catalog.maps.at(-5, 40)["capacity"].tolist()
+
+
+def test_select_at_batch_matches_select_at():
+    catalog = EquipmentCatalog()
+    rng = np.random.default_rng(1)
+    n = 600
+    required = rng.uniform(0, 22, n)
+    # the first 100 rooms share one operating point (indexed), the rest are spread out (scanned)
+    # some points fall on half tenths, where Python's round and np.rint disagree
+    t_evap = np.where(np.arange(n) < 100, -10.0, np.round(rng.uniform(-35, 0, n), 1))
+    t_evap[100:200] = rng.choice([-10.05, 0.35, -20.25, -4.15, -30.05], 100)
+    t_cond = np.where(np.arange(n) < 100, 45.0, rng.choice([40.0, 45.0, 50.0, 42.45, 47.35], n))
+    refrigerant = rng.choice(["R404A", "R449A"], n)
+    batch = catalog.select_at_batch(required, t_evap, t_cond, refrigerant)
+    for i in range(n):
+        compressor, _, rating = catalog.select_at(required[i], t_evap[i], t_cond[i], refrigerant[i])
+        position = batch["compressor"][i]
+        assert (catalog.compressors[position] if position >= 0 else None) is compressor
+        if rating is not None:
+            assert (batch["capacity"][i], batch["power"][i]) == (rating["capacity"], rating["power"])
+
+
+def brute_force_cover(capacities, prices, required, max_units):
+    best = None
+    for m in range(1, max_units + 1):
+        for chosen in itertools.combinations_with_replacement(range(len(capacities)), m):
+            if sum(capacities[i] for i in chosen) >= required:
+                price = sum(prices[i] for i in chosen)
+                if best is None or price < best:
+                    best = price
+    return best
+
+
+def random_items(rng, n):
+    capacity = np.round(rng.uniform(0.5, 20.0, n), 1)
+    price = np.round(100 + 60 * capacity ** rng.uniform(0.6, 1.1) + rng.uniform(-50, 50, n))
+    return capacity, price
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_cheapest_cover_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    capacity, price = random_items(rng, int(rng.integers(1, 9)))
+    keep = price_frontier(capacity, price)
+    caps, prices = capacity[keep].tolist(), price[keep].tolist()
+    for max_units in (1, 2, 3, 4, 6):
+        bounds = cost_lower_bounds(caps, prices, max_units, steps=256)
+        for required in rng.uniform(0.1, max_units * capacity.max() * 1.05, 5).tolist():
+            expected = brute_force_cover(capacity.tolist(), price.tolist(), required, max_units)
+            found = cheapest_cover(caps, prices, bounds, required, max_units)
+            if expected is None:
+                assert found is None
+                continue
+            total, chosen = found
+            assert total == pytest.approx(expected)
+            assert len(chosen) <= max_units
+            assert sum(caps[i] for i in chosen) >= required
+            assert sum(prices[i] for i in chosen) == pytest.approx(total)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cost_lower_bounds_are_lower_bounds(seed):
+    rng = np.random.default_rng(100 + seed)
+    capacity, price = random_items(rng, 6)
+    keep = price_frontier(capacity, price)
+    caps, prices = capacity[keep].tolist(), price[keep].tolist()
+    step, table = cost_lower_bounds(caps, prices, 3, steps=64)
+    for k in range(0, table.shape[1], 4):
+        for m in (1, 2, 3):
+            expected = brute_force_cover(caps, prices, k * step, m)
+            assert table[m - 1, k] <= (np.inf if expected is None else expected + 1e-9)
+
+
+def test_cheapest_combination_beats_single_units():
+    catalog = EquipmentCatalog()
+    combination = catalog.cheapest_combination(30.0, "capMed", max_units=4)
+    assert combination["capacity"] >= 30.0
+    assert combination["price"] == sum(c["price"] for c in combination["compressors"]) + sum(
+        e["price"] for e in combination["evaporators"])
+
+
+def test_capacity_index_first_fit_on_unsorted_catalog():
+    capacities = [5.0, 1.5, 9.0, 1.5, 3.0, 9.0, 0.5]
+    index = CapacityIndex(capacities)
+    loads = [0.0, 0.5, 0.6, 1.5, 2.0, 3.0, 4.0, 5.0, 8.9, 9.0, 9.1, float("nan")]
+    expected = [next((i for i, c in enumerate(capacities) if c >= load), -1) for load in loads]
+    assert [index.first_fit(load) for load in loads] == expected
+    assert index.first_fit_batch(loads).tolist() == expected
+
+
+def test_six_unit_combinations_stay_fast_on_a_large_catalog():
+    # 437.14 kW took 2.2 s at six units before the per-kW bound; most loads now take about 1 ms
+    catalog = synthetic_catalog(50_000, 5_000)
+    catalog.cheapest_combination(100.0, "capMed", max_units=6)  # build the frontier and bounds
+    loads = [437.14] + np.random.default_rng(0).uniform(120.0, 720.0, 40).tolist()
+    slowest = 0.0
+    for load in loads:
+        start = time.perf_counter()
+        catalog.cheapest_combination(load, "capMed", max_units=6)
+        slowest = max(slowest, time.perf_counter() - start)
+    assert slowest < 0.25
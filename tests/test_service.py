@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from refcalc import service
+from refcalc.data import COMPRESSOR_CATALOG
+from refcalc.service import LocalClient, SizingService
+
+
+def call(client, method, path, payload=None):
+    return asyncio.run(client.request(method, path, payload))
+
+
+@pytest.fixture
+def client():
+    return LocalClient(SizingService())
+
+
+def test_size_default_room(client):
+    status, result = call(client, "POST", "/size", {})
+    assert status == 200
+    assert result["requiredCapacity"] == 1.0722489259259258
+    assert result["selectedCompressor"]["model"] == "2JES-07Y"
+    assert result["selectedEvaporator"]["model"] == "ECO-3"
+    assert result["warnings"] == []
+
+
+def test_size_batch_matches_single(client):
+    rooms = [{}, {"length": 6, "tempInternal": -22, "tEvap": -30, "productType": "frozen"}]
+    status, results = call(client, "POST", "/size/batch", rooms)
+    assert status == 200
+    assert [r["requiredCapacity"] for r in results] == [call(client, "POST", "/size", room)[1]["requiredCapacity"]
+                                                         for room in rooms]
+
+
+def test_normalized_inputs_hit_the_cache(client):
+    call(client, "POST", "/size", {"length": 3.0})
+    call(client, "POST", "/size", {"length": 3.04})
+    cache = call(client, "GET", "/metrics")[1]["cache"]
+    assert cache["hits"] == 1
+    assert cache["misses"] == 1
+    assert cache["size"] == 1
+
+
+def test_cache_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(service.time, "monotonic", lambda: now[0])
+    client = LocalClient(SizingService(ttl=10.0))
+    call(client, "POST", "/size", {})
+    now[0] += 5
+    call(client, "POST", "/size", {})
+    now[0] += 11
+    call(client, "POST", "/size", {})
+    cache = call(client, "GET", "/metrics")[1]["cache"]
+    assert (cache["hits"], cache["misses"]) == (1, 2)
+
+
+def test_catalog_update_clears_cache(client):
+    call(client, "POST", "/size", {})
+    compressors = [dict(c, model=c["model"] + "-X") for c in COMPRESSOR_CATALOG]
+    status, body = call(client, "POST", "/catalog", {"compressors": compressors})
+    assert (status, body) == (200, {"catalogVersion": 1})
+    status, result = call(client, "POST", "/size", {})
+    assert result["selectedCompressor"]["model"] == "2JES-07Y-X"
+    metrics = call(client, "GET", "/metrics")[1]
+    assert metrics["catalogVersion"] == 1
+    assert metrics["cache"]["hits"] == 0
+
+
+@pytest.mark.parametrize("room", [
+    {"productType": ["meat"]},
+    {"productType": "ice"},
+    {"refrigerant": [1]},
+    {"refrigerant": "R22"},
+    {"length": True},
+    {"length": "long"},
+    {"length": -1},
+    {"insulation": 90},
+    {"tEvap": float("inf")},
+    {"colour": "red"},
+    [],
+])
+def test_bad_room_is_400(client, room):
+    status, body = call(client, "POST", "/size", room)
+    assert status == 400
+    assert "error" in body
+
+
+@pytest.mark.parametrize("catalog", [
+    {"compressors": "abc"},
+    {"compressors": []},
+    {"compressors": [{"model": "x"}]},
+    {"compressors": [dict(COMPRESSOR_CATALOG[0], price=True)]},
+    {"evaporators": []},
+    {"evaporators": [1, 2]},
+    [],
+])
+def test_bad_catalog_is_400(client, catalog):
+    status, body = call(client, "POST", "/catalog", catalog)
+    assert status == 400
+    assert "error" in body
+    assert call(client, "GET", "/metrics")[1]["catalogVersion"] == 0
+
+
+def test_bad_json_and_unknown_route(client):
+    assert client.service.dispatch("POST", "/size", b"{")[0] == 400
+    assert call(client, "GET", "/size")[0] == 404
+
+
+def test_unexpected_error_is_500(client, monkeypatch):
+    def boom(inputs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(client.service, "size", boom)
+    status, body = call(client, "POST", "/size", {})
+    assert status == 500
+    assert call(client, "GET", "/metrics")[1]["errors"] == 1
+
+
+def test_oversized_room_gets_combination(client):
+    status, result = call(client, "POST", "/size", {"length": 30, "width": 20, "height": 6, "productLoad": 20000})
+    assert status == 200
+    assert result["selectedCompressor"] is None
+    assert len(result["combination"]["compressors"]) >= 2
+
+
+def test_room_without_a_single_evaporator_gets_combination(client):
+    status, result = call(client, "POST", "/size", {"length": 26, "width": 10, "height": 4})
+    assert status == 200
+    assert result["selectedCompressor"]["model"] == "4PES-12Y"
+    assert result["selectedEvaporator"] is None
+    combination = result["combination"]
+    assert combination["capacity"] >= result["requiredCapacity"]
+    assert len(combination["evaporators"]) >= 2
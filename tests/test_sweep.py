@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from refcalc import calculate
+from refcalc.sweep import RESULT_COLUMNS, Sweep
+
+AXES = {
+    "length": [3.0, 8.0, 14.0, 40.0],
+    "tempInternal": [-25.0, -18.0, 2.0],
+    "productType": ["meat", "frozen", "vegetables"],
+    "insulation": [80, 100, 150],
+    "tEvap": [-30.0, -10.0],
+}
+
+
+@pytest.mark.parametrize("operating_point", [False, True])
+def test_evaluate_matches_calculate(operating_point):
+    sweep = Sweep(AXES, base={"width": 6.0}, operating_point=operating_point)
+    flat = np.arange(sweep.size)
+    result = sweep.evaluate(flat)
+    catalog = sweep.catalog
+    for i in flat.tolist():
+        inputs = {k: (v[0].item() if isinstance(v, np.ndarray) else v)
+                  for k, v in sweep.columns(np.array([i])).items()}
+        expected = calculate(inputs, catalog.compressors, catalog.evaporators,
+                             maps=catalog.maps if operating_point else None)
+        for name in RESULT_COLUMNS:
+            assert result[name][i] == expected[name]
+        compressor, evaporator = result["compressor"][i], result["evaporator"][i]
+        assert (catalog.compressors[compressor] if compressor >= 0 else None) is expected["selectedCompressor"]
+        assert (catalog.evaporators[evaporator] if evaporator >= 0 else None) is expected["selectedEvaporator"]
+        if operating_point and compressor >= 0:
+            assert result["eer"][i] == expected["eer"]
+
+
+def switch_rows(switches):
+    return sorted(zip(*(switches[k].tolist() for k in ("index", "axis", "component", "from", "to", "at", "next"))),
+                  key=repr)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 50])
+def test_switches_do_not_depend_on_chunking(chunk_size):
+    sweep = Sweep(AXES)
+    flat = np.arange(sweep.size)
+    whole = switch_rows(sweep.switches(flat, sweep.evaluate(flat)))
+    assert whole
+    chunked = []
+    for start in range(0, sweep.size, chunk_size):
+        part = flat[start:start + chunk_size]
+        chunked += switch_rows(sweep.switches(part, sweep.evaluate(part)))
+    assert sorted(chunked, key=repr) == whole